@@ -1,27 +1,54 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Dict, List
 from uuid import UUID
 
 from app.db.session import get_db
 from app.schemas.message import (
     MessageCreate,
+    MessageUpdate,
     MessagePublic,
     ConversationCreate,
     ConversationPublic,
     ConversationWithMessages
 )
 from app.services.message import message_service
-# ⬇️ SUPPRESSION: Import bloquant au niveau module
-# from app.services.mbart_translator import translation as translation_service
+from app.services.mbart_translator.segmentation import diff_segments
+from app.services.translation_pipeline import translation_pipeline
 from app.core.dependencies import get_current_user
 from app.models.user import User
-from app.models.message import TranslationStatusEnum
+from app.models.message import Message, MessageTranslation, TranslationStatusEnum
+from app.models.user import LanguageEnum
 from app.websocket.manager import manager
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
 
 
+def localize_message(
+    message: Message,
+    translations: Dict[UUID, MessageTranslation],
+    language: LanguageEnum
+) -> MessagePublic:
+    """Serve a message with the translation matching the viewer's language"""
+    message_public = MessagePublic.model_validate(message)
+    translation = translations.get(message.id)
+    
+    if translation is not None:
+        return message_public.model_copy(update={
+            "translated_content": translation.translated_content,
+            "target_language": language,
+        })
+    
+    # Group messages have no single-language fallback
+    if message.receiver_id is None or message.target_language != language:
+        return message_public.model_copy(update={
+            "translated_content": None,
+            "target_language": None,
+        })
+    
+    return message_public
+
+
 @router.post("/conversations", response_model=ConversationPublic, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
     conversation_create: ConversationCreate,
@@ -51,6 +78,12 @@ async def get_conversations(
     """Get all conversations for the current user."""
     conversations = await message_service.get_user_conversations(db, current_user.id)
     
+    # Translations of last messages in the current user's language
+    last_message_ids = [conv.messages[-1].id for conv in conversations if conv.messages]
+    translations = await message_service.get_translations(
+        db, last_message_ids, current_user.preferred_language
+    )
+    
     # Transform to ConversationPublic schema
     result = []
     for conv in conversations:
@@ -71,7 +104,10 @@ async def get_conversations(
             is_group=conv.is_group,
             name=conv.name,
             participants=participants,
-            last_message=last_message,
+            last_message=(
+                localize_message(last_message, translations, current_user.preferred_language)
+                if last_message else None
+            ),
             unread_count=unread,
             created_at=conv.created_at,
             updated_at=conv.updated_at
@@ -100,6 +136,19 @@ async def get_conversation_with_messages(
         offset
     )
     
+    # Each participant is served their own language
+    translations = await message_service.get_translations(
+        db, [m.id for m in messages], current_user.preferred_language
+    )
+    # Lazy mode: messages never translated for this language are translated now
+    translations.update(await message_service.translate_on_read(
+        db, messages, translations, current_user.preferred_language, current_user.id
+    ))
+    messages = [
+        localize_message(m, translations, current_user.preferred_language)
+        for m in messages
+    ]
+    
     # Get conversation details
     conversations = await message_service.get_user_conversations(db, current_user.id)
     conversation = next((c for c in conversations if c.id == conv_id), None)
@@ -128,49 +177,23 @@ async def send_message(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Send a message to another user.
-    Message will be automatically translated to receiver's preferred language.
+    Send a message to another user (`receiver_id`) or to a group (`conversation_id`).
+    Message is returned immediately and translated in the background, once per
+    distinct participant language (`message_translated` WebSocket event).
     """
-    # Send message
+    # Send message (committed as PENDING when a translation is needed)
     message = await message_service.send_message(db, message_create, current_user.id)
     
-    # Get receiver to determine target language
-    from app.services.auth import auth_service
-    receiver = await auth_service.get_user_by_id(db, message_create.receiver_id)
-    
-    # Translate message if languages differ
-    if receiver and receiver.preferred_language != message.original_language:
-        try:
-            # ⬇️ IMPORT DIFFÉRÉ ICI - uniquement quand on envoie un message
-            from app.services.mbart_translator import translation as translation_service
-            
-            translation = await translation_service.translate_text(
-                text=message.content,
-                source_language=message.original_language,
-                target_language=receiver.preferred_language,
-                tone=message.tone
-            )
-            
-            message.translated_content = translation.translated_text
-            message.target_language = receiver.preferred_language
-            message.translation_status = TranslationStatusEnum.TRANSLATED
-            
-            await db.commit()
-            await db.refresh(message)
-            
-        except Exception as e:
-            message.translation_status = TranslationStatusEnum.FAILED
-            await db.commit()
-    
     # Broadcast message via WebSocket
     message_data = {
         "id": str(message.id),
         "content": message.content,
         "translated_content": message.translated_content,
         "sender_id": str(message.sender_id),
-        "receiver_id": str(message.receiver_id),
+        "receiver_id": str(message.receiver_id) if message.receiver_id else None,
         "conversation_id": str(message.conversation_id),
         "status": message.status.value,
+        "translation_status": message.translation_status.value if message.translation_status else None,
         "created_at": message.created_at.isoformat()
     }
     
@@ -180,6 +203,17 @@ async def send_message(
         current_user.id
     )
     
+    # Queue translation (interactive if a recipient is online; stays PENDING if shed)
+    if message.translation_status == TranslationStatusEnum.PENDING:
+        languages = await message_service.get_participant_languages(
+            db, message.conversation_id, exclude_user=current_user.id
+        )
+        translation_pipeline.enqueue(
+            message.id,
+            current_user.id,
+            [user_id for user_ids in languages.values() for user_id in user_ids]
+        )
+    
     return message
 
 
@@ -203,6 +237,56 @@ async def mark_message_read(
     return message
 
 
+@router.patch("/messages/{message_id}", response_model=MessagePublic)
+async def edit_message(
+    message_id: str,
+    message_update: MessageUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Edit a message's content (sender only).
+    Participants receive a `message_edited` delta right away, then one with the
+    translation delta in their language once only the changed sentences are
+    retranslated.
+    """
+    if message_update.content is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Nothing to update"
+        )
+    
+    message, previous_content, previous_translations = await message_service.edit_message(
+        db, UUID(message_id), current_user.id, message_update.content
+    )
+    
+    # Delta of the original content for everyone (including sender's other devices)
+    await manager.broadcast_message_edited(
+        {
+            "id": str(message.id),
+            "conversation_id": str(message.conversation_id),
+            "ops": diff_segments(previous_content, message.content),
+            "translation_status": message.translation_status.value if message.translation_status else None,
+            "updated_at": message.updated_at.isoformat() if message.updated_at else None
+        },
+        message.conversation_id
+    )
+    
+    if message.translation_status == TranslationStatusEnum.PENDING:
+        languages = await message_service.get_participant_languages(
+            db, message.conversation_id, exclude_user=current_user.id
+        )
+        translation_pipeline.enqueue_edit(
+            message.id,
+            current_user.id,
+            [user_id for user_ids in languages.values() for user_id in user_ids],
+            previous_content,
+            previous_translations
+        )
+    
+    return localize_message(message, {}, current_user.preferred_language)
+
+
 @router.delete("/messages/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_message(
     message_id: str,
@@ -3,9 +3,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.schemas.user import UserUpdate, UserSettings, UserInDB
-from app.schemas.message import TranslationRequest, TranslationResponse
+from app.schemas.message import (
+    TranslationRequest,
+    TranslationResponse,
+    BatchTranslationRequest,
+    BatchTranslationResponse
+)
 from app.services.auth import auth_service
-from app.services.mbart_translator import translation as translation_service
+from app.services.language_change import language_change_service
+from app.services.translation import translation_service
 from app.core.dependencies import get_current_user
 from app.models.user import User
 
@@ -39,10 +45,16 @@ async def update_my_settings(
     Can update:
     - full_name
     - avatar_url
-    - preferred_language
+    - preferred_language (recent messages are retranslated, `message_translated` events)
     - preferred_tone
     """
+    previous_language = current_user.preferred_language
     user = await auth_service.update_user(db, current_user.id, user_update)
+    
+    # Recent history is retranslated in the background and streamed to the user
+    if user.preferred_language != previous_language:
+        language_change_service.schedule(user.id, user.preferred_language)
+    
     return user
 
 
@@ -61,10 +73,31 @@ async def translate_text(
     
     Returns translated text with confidence score.
     """
-    translation = await translation_service.translate_request(translation_request)
+    translation = await translation_service.translate_request(
+        translation_request,
+        current_user.id
+    )
     return translation
 
 
+@router.post("/translate/batch", response_model=BatchTranslationResponse)
+async def translate_batch(
+    batch_request: BatchTranslationRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Translate up to 100 texts in one request.
+    
+    - **items**: List of translation requests (text, languages, tone)
+    
+    Results are returned in the same order, each with a status:
+    `translated`, `skipped` (nothing to translate or same language) or `failed`.
+    Identical items are translated once. Returns 503 when the translation
+    service is overloaded.
+    """
+    return await translation_service.translate_batch(batch_request, current_user.id)
+
+
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_my_account(
     db: AsyncSession = Depends(get_db),
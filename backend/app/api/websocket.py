@@ -7,6 +7,7 @@ from app.websocket.manager import manager
 from app.db.session import get_db
 from app.core.security import security
 from app.services.auth import auth_service
+from app.services.message import message_service
 
 router = APIRouter()
 
@@ -36,6 +37,16 @@ async def websocket_endpoint(
     }
     ```
     
+    - Presence of users outside shared conversations (contacts are automatic);
+      answered with a "presence_batch" of their current state:
+    ```json
+    {
+        "type": "presence_subscribe",
+        "user_ids": ["uuid"]
+    }
+    ```
+    ("presence_unsubscribe" takes the same payload)
+    
     2. **Outgoing (Server -> Client):**
     
     - New message:
@@ -51,19 +62,71 @@ async def websocket_endpoint(
     }
     ```
     
-    - User status:
+    - Translation progress (long messages, one event per sentence; concatenate
+      `text` in `index` order until the closing "message_translated"):
     ```json
     {
-        "type": "user_status",
+        "type": "translation_progress",
         "data": {
-            "user_id": "uuid",
-            "is_online": true,
-            "timestamp": "2024-01-01T00:00:00Z"
+            "id": "uuid",
+            "conversation_id": "uuid",
+            "target_language": "fr",
+            "index": 0,
+            "total": 3,
+            "text": "Bonjour à tous. "
+        }
+    }
+    ```
+    
+    - Translation completed (follows a "message" sent as pending):
+    ```json
+    {
+        "type": "message_translated",
+        "data": {
+            "id": "uuid",
+            "conversation_id": "uuid",
+            "translated_content": "Bonjour !",
+            "target_language": "fr",
+            "translation_status": "translated"
+        }
+    }
+    ```
+    
+    - Message edited (character ranges of the previous text, apply last to first;
+      a second event carries `target_language` and `translated_ops`, or the full
+      `translated_content` when there was no previous translation):
+    ```json
+    {
+        "type": "message_edited",
+        "data": {
+            "id": "uuid",
+            "conversation_id": "uuid",
+            "ops": [{"start": 13, "end": 26, "text": "How are you doing? "}],
+            "translation_status": "pending",
+            "updated_at": "2024-01-01T00:00:00Z"
+        }
+    }
+    ```
+    
+    - Presence of contacts and subscriptions (periodic, only when something
+      changed; going offline is reported after a grace period):
+    ```json
+    {
+        "type": "presence_batch",
+        "data": {
+            "users": [
+                {
+                    "user_id": "uuid",
+                    "is_online": true,
+                    "timestamp": "2024-01-01T00:00:00Z"
+                }
+            ]
         }
     }
     ```
     
-    - Typing indicator:
+    - Typing indicator (state changes, a refresh every few seconds while typing,
+      and is_typing false on timeout or disconnect):
     ```json
     {
         "type": "typing",
@@ -102,8 +165,9 @@ async def websocket_endpoint(
         await websocket.close(code=1008, reason="Invalid token")
         return
     
-    # Connect user
-    await manager.connect(websocket, user_id)
+    # Connect user (joins the rooms of their conversations)
+    conversation_rooms = await message_service.get_conversation_rooms(db, user_id)
+    await manager.connect(websocket, user_id, conversation_rooms)
     
     # Update user status in database
     await auth_service.update_user_status(db, user_id, is_online=True)
@@ -117,11 +181,11 @@ async def websocket_endpoint(
             message_type = message_data.get("type")
             
             if message_type == "typing":
-                # Handle typing indicator
+                # Handle typing indicator (only state changes are forwarded)
                 conversation_id = UUID(message_data.get("conversation_id"))
                 is_typing = message_data.get("is_typing", False)
                 
-                await manager.broadcast_typing_indicator(
+                await manager.set_typing(
                     user_id,
                     conversation_id,
                     is_typing
@@ -138,16 +202,29 @@ async def websocket_endpoint(
                     conversation_id
                 )
             
+            elif message_type == "presence_subscribe":
+                user_ids = [UUID(uid) for uid in message_data.get("user_ids", [])]
+                snapshot = manager.subscribe_presence(user_id, user_ids)
+                
+                await manager.send_to_socket({
+                    "type": "presence_batch",
+                    "data": {"users": snapshot}
+                }, websocket, user_id)
+            
+            elif message_type == "presence_unsubscribe":
+                user_ids = [UUID(uid) for uid in message_data.get("user_ids", [])]
+                manager.unsubscribe_presence(user_id, user_ids)
+            
             elif message_type == "ping":
                 # Heartbeat
-                await websocket.send_json({"type": "pong"})
+                await manager.send_to_socket({"type": "pong"}, websocket, user_id)
             
             else:
                 # Unknown message type
-                await websocket.send_json({
+                await manager.send_to_socket({
                     "type": "error",
                     "message": f"Unknown message type: {message_type}"
-                })
+                }, websocket, user_id)
     
     except WebSocketDisconnect:
         # Handle disconnect
@@ -35,11 +35,109 @@ class Settings(BaseSettings):
     # Translation API
     GOOGLE_TRANSLATE_API_KEY: Optional[str] = None
     DEEPL_API_KEY: Optional[str] = None
-    TRANSLATION_PROVIDER: str = "google"  # or "deepl"
-    
+    TRANSLATION_PROVIDER: str = "huggingface"  # "local", "google", "deepl" or "router"
+    GOOGLE_TRANSLATE_URL: str = "https://translation.googleapis.com/language/translate/v2"
+    DEEPL_API_URL: str = "https://api-free.deepl.com/v2/translate"
+
+    # Multi-provider routing (TRANSLATION_PROVIDER="router")
+    TRANSLATION_ROUTER_PROVIDERS: str = "huggingface,deepl,google"  # preference order on ties
+    TRANSLATION_ROUTER_WINDOW: int = 100  # latency/error samples kept per (provider, pair)
+    TRANSLATION_ROUTER_MIN_SAMPLES: int = 5  # below this, a provider is explored first
+    TRANSLATION_ROUTER_EXPLORE_RATIO: float = 0.05  # share of calls sent to a non-best provider
+
+    # Translation HTTP client (remote providers)
+    HF_INFERENCE_URL: str = "https://router.huggingface.co/hf-inference/models"
+    TRANSLATION_HTTP2: bool = True
+    TRANSLATION_CONNECT_TIMEOUT: float = 5.0
+    TRANSLATION_READ_TIMEOUT: float = 10.0  # keep below TRANSLATION_DEADLINE so a hung provider fails first
+    TRANSLATION_MAX_CONNECTIONS: int = 100
+    TRANSLATION_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+    # Local CPU translation backend (TRANSLATION_PROVIDER="local")
+    LOCAL_TRANSLATION_MODEL_PATH: str = "models/mbart-large-50-mmt-ct2-int8"  # CTranslate2 conversion
+    LOCAL_TRANSLATION_TOKENIZER: str = "facebook/mbart-large-50-many-to-many-mmt"
+    LOCAL_TRANSLATION_COMPUTE_TYPE: str = "int8"
+    LOCAL_TRANSLATION_PROCESSES: int = 2
+    LOCAL_TRANSLATION_THREADS: int = 2  # intra-op threads per process
+    LOCAL_TRANSLATION_BEAM_SIZE: int = 2
+    LOCAL_TRANSLATION_MAX_LENGTH: int = 256  # max decoded tokens
+
+    # Translation cache
+    TRANSLATION_CACHE_ENABLED: bool = True
+    TRANSLATION_CACHE_MEMORY_BYTES: int = 32 * 1024 * 1024  # 32MB per worker
+    TRANSLATION_CACHE_PATH: Optional[str] = "/tmp/multichat/translations.sqlite3"  # None = memory only
+    TRANSLATION_CACHE_TTL: int = 30 * 24 * 3600  # 30 days
+    TRANSLATION_CACHE_MAX_DISK_ENTRIES: int = 500_000
+
+    # Translation cache warm-up at startup (most frequent recent translations)
+    TRANSLATION_WARMUP_ENABLED: bool = True
+    TRANSLATION_WARMUP_DAYS: int = 7  # history scanned
+    TRANSLATION_WARMUP_MAX_ENTRIES: int = 5000
+    TRANSLATION_WARMUP_MAX_BYTES: int = 8 * 1024 * 1024  # 8MB of text
+    TRANSLATION_WARMUP_TIMEOUT: float = 30.0  # seconds
+
+    # Translation micro-batching
+    TRANSLATION_BATCH_MAX_SIZE: int = 16
+    TRANSLATION_BATCH_MAX_WAIT_MS: int = 10
+
+    # Local language identification (skip / fix source before calling the provider)
+    TRANSLATION_LANGID_ENABLED: bool = True
+    TRANSLATION_LANGID_MIN_CONFIDENCE: float = 0.8
+    TRANSLATION_LANGID_MIN_LETTERS: int = 12
+
+    # Pivot translation for multi-target fan-out
+    TRANSLATION_PIVOT_ENABLED: bool = False
+    TRANSLATION_PIVOT_LANGUAGE: str = "en"
+    TRANSLATION_PIVOT_MIN_SAMPLES: int = 20  # latency samples needed before choosing a route
+
+    # Translation resilience (circuit breaker, deadlines, hedged requests)
+    TRANSLATION_BREAKER_FAILURES: int = 5  # consecutive provider failures before failing fast
+    TRANSLATION_BREAKER_RESET: float = 30.0  # seconds before a half-open probe
+    TRANSLATION_DEADLINE: float = 15.0  # default budget of one translate() call, in seconds
+    TRANSLATION_READ_DEADLINE: float = 3.0  # budget of translate-on-read for a page
+    TRANSLATION_HEDGE_ENABLED: bool = False  # duplicate calls slower than the pair's p95
+    TRANSLATION_HEDGE_MIN_SAMPLES: int = 20
+
+    # Translation pipeline (priority scheduler: interactive > background > batch)
+    # Workers are asyncio tasks, each holding one job for its whole provider round trip:
+    # this is the number of messages in flight per process, and the micro-batcher only
+    # groups what is in flight, so keep it several times TRANSLATION_BATCH_MAX_SIZE
+    # (provider connections stay capped by TRANSLATION_MAX_CONNECTIONS)
+    TRANSLATION_WORKERS: int = 64
+    TRANSLATION_INTERACTIVE_WORKERS: int = 16  # workers reserved for online recipients
+    TRANSLATION_QUEUE_SIZE: int = 1000  # max queued jobs per priority class
+    TRANSLATION_QUEUE_MAX_PER_USER: int = 100  # max queued jobs per user and class
+    TRANSLATION_QUEUE_MAX_WAIT: float = 30.0  # seconds; older jobs are shed (left PENDING)
+    TRANSLATION_LAZY: bool = False  # offline recipients: translate on first read instead of at send
+
+    # Translation backfill (retry of FAILED / PENDING messages)
+    TRANSLATION_BACKFILL_ENABLED: bool = True
+    TRANSLATION_BACKFILL_INTERVAL: float = 60.0  # seconds between passes
+    TRANSLATION_BACKFILL_BATCH_SIZE: int = 50  # messages per page / bulk write
+    TRANSLATION_BACKFILL_CONCURRENCY: int = 4  # messages translated at once
+    TRANSLATION_BACKFILL_RATE: float = 20.0  # max messages per second
+    TRANSLATION_BACKFILL_MIN_AGE: float = 120.0  # seconds; younger PENDING messages belong to the pipeline
+    TRANSLATION_BACKFILL_BASE_DELAY: float = 60.0  # first retry delay, doubled on each failure
+    TRANSLATION_BACKFILL_MAX_DELAY: float = 6 * 3600
+    TRANSLATION_BACKFILL_MAX_ATTEMPTS: int = 8
+
+    # Retranslation after a preferred_language change
+    TRANSLATION_RETRANSLATE_CONVERSATIONS: int = 20  # most recently active conversations
+    TRANSLATION_RETRANSLATE_MESSAGES: int = 50  # latest messages per conversation
+    TRANSLATION_RETRANSLATE_BATCH_SIZE: int = 20  # first batch runs at interactive priority
+
     # WebSocket
-    WS_MESSAGE_QUEUE_SIZE: int = 100
+    WS_MESSAGE_QUEUE_SIZE: int = 100  # outbound frames buffered per connection
     WS_HEARTBEAT_INTERVAL: int = 30
+    WS_SEND_TIMEOUT: float = 5.0  # seconds per socket write; slower sockets are evicted
+    WS_DROPPABLE_EVENTS: list = ["typing", "presence_batch", "translation_progress"]  # dropped first when a queue is full
+    WS_EVICT_SLOW_CONSUMERS: bool = True  # close connections whose queue stays full for WS_SEND_TIMEOUT
+    WS_PRESENCE_GRACE: float = 10.0  # seconds offline before contacts are told (absorbs reconnects)
+    WS_PRESENCE_BATCH_INTERVAL: float = 1.0  # presence_batch frame period
+    WS_PRESENCE_MAX_SUBSCRIPTIONS: int = 200  # explicit presence subscriptions per user
+    WS_TYPING_TIMEOUT: float = 6.0  # typing state expires without a refresh (is_typing false sent)
+    WS_TYPING_REFRESH_INTERVAL: float = 3.0  # at most one is_typing true refresh per interval
+    WS_BACKPLANE: str = ""  # cross-worker fan-out: "" (single worker), "memory" (tests) or "redis" (REDIS_URL)
     
     # File Upload
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
@@ -1,3 +1,4 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from typing import AsyncGenerator
@@ -24,6 +25,15 @@ AsyncSessionLocal = async_sessionmaker(
 # Base class for models
 Base = declarative_base()
 
+# create_all() only creates missing tables: column changes to existing tables
+# are upgraded here (idempotent, run on every start)
+SCHEMA_UPGRADES = [
+    # Group messages have no receiver
+    "ALTER TABLE messages ALTER COLUMN receiver_id DROP NOT NULL",
+    "ALTER TABLE messages ADD COLUMN IF NOT EXISTS translation_attempts INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE messages ADD COLUMN IF NOT EXISTS translation_retry_at TIMESTAMP WITH TIME ZONE",
+]
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -48,6 +58,8 @@ async def init_db() -> None:
     """Initialize database tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
 
 
 async def close_db() -> None:
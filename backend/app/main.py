@@ -1,11 +1,20 @@
-from fastapi import FastAPI, HTTPException  # ⬅️ AJOUT: HTTPException pour translate_endpoint
+from fastapi import FastAPI, HTTPException, Depends, status  # ⬅️ AJOUT: HTTPException pour translate_endpoint
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import os
 
 from app.core.config import settings
 from app.api import api_router
 from app.db.session import init_db, close_db
+from app.services.language_change import language_change_service
+from app.services.translation_backfill import translation_backfill
+from app.services.translation_scheduler import Priority, SchedulerOverloaded, translation_scheduler
+from app.services.translation_warmup import warm_translation_cache
+from app.websocket.manager import manager
+from app.core.dependencies import get_current_user
+from app.models.user import User
 
 
 @asynccontextmanager
@@ -17,11 +26,22 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting MultiChat API...")
     await init_db()
     print("✅ Database initialized")
+    await translation_scheduler.start()
+    print("✅ Translation scheduler started")
+    # Background: readiness does not wait for the cache warm-up
+    warmup_task = asyncio.create_task(warm_translation_cache())
+    await translation_backfill.start()
+    await manager.start()
     
     yield
     
     # Shutdown
     print("👋 Shutting down MultiChat API...")
+    warmup_task.cancel()
+    await manager.stop()
+    await translation_backfill.stop()
+    await language_change_service.stop()
+    await translation_scheduler.stop()
     await close_db()
     print("✅ Database connections closed")
 
@@ -104,23 +124,79 @@ async def translate_endpoint(
     text: str, 
     source: str, 
     target: str, 
-    tone: str = "standard"
+    tone: str = "standard",
+    current_user: User = Depends(get_current_user)
 ):
     """
-    Traduction via l'API Hugging Face (instantané, sans chargement)
+    Traduction via le backend configuré, soumise à l'ordonnanceur
+    (équité entre utilisateurs, 503 en cas de surcharge)
     """
+    from app.services.mbart_translator import MBartTranslator
+    
     translator = await MBartTranslator.get_instance()
-    result = await translator.translate(text, source, target, tone)
-    return result
+    try:
+        return await translation_scheduler.run(
+            lambda: translator.translate(text, source, target, tone),
+            Priority.INTERACTIVE,
+            current_user.id
+        )
+    except SchedulerOverloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Translation service overloaded, retry later",
+            headers={"Retry-After": "5"}
+        )
+
+# Description et identifiants requis de chaque backend de traduction
+PROVIDER_DESCRIPTIONS = {
+    "huggingface": "l'API Hugging Face - aucun modèle chargé localement",
+    "local": "le modèle mBART local (CPU)",
+    "google": "l'API Google Translate",
+    "deepl": "l'API DeepL",
+}
+
+
+def _provider_configured(name: str) -> bool:
+    """Vrai si les identifiants du backend sont définis"""
+    if name == "huggingface":
+        return bool(os.environ.get("HF_TOKEN"))
+    if name == "google":
+        return bool(settings.GOOGLE_TRANSLATE_API_KEY)
+    if name == "deepl":
+        return bool(settings.DEEPL_API_KEY)
+    return True
+
 
 @app.get("/translate/status")
 async def translation_status():
-    """Vérifie que l'API est configurée"""
-    has_token = bool(os.environ.get("HF_TOKEN"))
+    """Vérifie que le backend actif est configuré et expose les compteurs de traduction"""
+    from app.services.mbart_translator import MBartTranslator
+    
+    # Le traducteur n'est pas chargé juste pour ses statistiques
+    translator = MBartTranslator._instance
+    provider = translator.provider.name if translator is not None else settings.TRANSLATION_PROVIDER
+    
+    if provider == "router":
+        names = [n.strip() for n in settings.TRANSLATION_ROUTER_PROVIDERS.split(",") if n.strip()]
+        ready = any(_provider_configured(name) for name in names)
+        message = "Aiguillage entre " + ", ".join(
+            PROVIDER_DESCRIPTIONS.get(name, name) for name in names
+        )
+    else:
+        ready = _provider_configured(provider)
+        message = f"Utilise {PROVIDER_DESCRIPTIONS.get(provider, provider)}"
+    
     return {
-        "status": "ready" if has_token else "missing_token",
-        "message": "Utilise l'API Hugging Face - aucun modèle chargé localement"
-    }# ⬇️ AJOUT: Endpoint /kaithheathcheck OBLIGATOIRE pour Leapcell
+        "status": "ready" if ready else "missing_token",
+        "provider": provider,
+        "message": message,
+        "translator": translator.get_stats() if translator is not None else None,
+        "scheduler": translation_scheduler.get_stats(),
+        "backfill": translation_backfill.get_stats(),
+        "websocket": manager.get_stats()
+    }
+
+# ⬇️ AJOUT: Endpoint /kaithheathcheck OBLIGATOIRE pour Leapcell
 @app.get("/kaithheathcheck")
 async def kaith_heathcheck():
     """Healthcheck requis par Leapcell - doit répondre immédiatement"""
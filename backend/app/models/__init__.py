@@ -1,6 +1,7 @@
 from app.models.user import User, LanguageEnum, MessageToneEnum
 from app.models.message import (
     Message,
+    MessageTranslation,
     Conversation,
     ConversationParticipant,
     MessageStatusEnum,
@@ -10,6 +11,7 @@ from app.models.message import (
 __all__ = [
     "User",
     "Message",
+    "MessageTranslation",
     "Conversation",
     "ConversationParticipant",
     "LanguageEnum",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum, Integer, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -63,6 +63,9 @@ class Message(Base):
         SQLEnum(TranslationStatusEnum),
         nullable=True
     )
+    # Backfill retries of a FAILED translation (reset by an edit)
+    translation_attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    translation_retry_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     sender_id = Column(
@@ -71,10 +74,11 @@ class Message(Base):
         nullable=False,
         index=True
     )
+    # Null for group messages
     receiver_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
+        nullable=True,
         index=True
     )
     conversation_id = Column(
@@ -93,11 +97,57 @@ class Message(Base):
     sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_messages")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_messages")
     conversation = relationship("Conversation", back_populates="messages")
+    translations = relationship(
+        "MessageTranslation",
+        back_populates="message",
+        cascade="all, delete-orphan"
+    )
     
     def __repr__(self):
         return f"<Message {self.id}>"
 
 
+class MessageTranslation(Base):
+    """Translation of a message into one participant language"""
+    __tablename__ = "message_translations"
+    __table_args__ = (
+        UniqueConstraint("message_id", "language", name="uq_message_translations_message_language"),
+    )
+    
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+    
+    message_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("messages.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    language = Column(
+        SQLEnum(LanguageEnum),
+        nullable=False
+    )
+    translated_content = Column(Text, nullable=True)
+    status = Column(
+        SQLEnum(TranslationStatusEnum),
+        default=TranslationStatusEnum.PENDING,
+        nullable=False
+    )
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    message = relationship("Message", back_populates="translations")
+    
+    def __repr__(self):
+        return f"<MessageTranslation message={self.message_id} lang={self.language}>"
+
+
 class Conversation(Base):
     """Conversation model"""
     __tablename__ = "conversations"
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
@@ -15,9 +15,17 @@ class MessageBase(BaseModel):
 
 
 class MessageCreate(MessageBase):
-    """Schema for creating a message"""
-    receiver_id: UUID
+    """Schema for creating a message (1-on-1 via receiver_id, group via conversation_id)"""
+    receiver_id: Optional[UUID] = None
+    conversation_id: Optional[UUID] = None
     original_language: Optional[LanguageEnum] = None
+    
+    @model_validator(mode='after')
+    def validate_recipient(self) -> 'MessageCreate':
+        """Require a receiver or a conversation"""
+        if not self.receiver_id and not self.conversation_id:
+            raise ValueError('Either receiver_id or conversation_id is required')
+        return self
 
 
 class MessageUpdate(BaseModel):
@@ -30,7 +38,7 @@ class MessageInDB(MessageBase):
     """Schema for message in database"""
     id: UUID
     sender_id: UUID
-    receiver_id: UUID
+    receiver_id: Optional[UUID] = None
     conversation_id: UUID
     original_language: LanguageEnum
     translated_content: Optional[str] = None
@@ -56,7 +64,8 @@ class MessagePublic(BaseModel):
     status: MessageStatusEnum
     translation_status: Optional[TranslationStatusEnum] = None
     sender_id: UUID
-    receiver_id: UUID
+    receiver_id: Optional[UUID] = None
+    conversation_id: Optional[UUID] = None
     created_at: datetime
     read_at: Optional[datetime] = None
     
@@ -155,3 +164,21 @@ class TranslationResponse(BaseModel):
     source_language: LanguageEnum
     target_language: LanguageEnum
     confidence: Optional[float] = None
+
+
+class BatchTranslationRequest(BaseModel):
+    """Batch translation request (results are returned in the same order)"""
+    items: List[TranslationRequest] = Field(..., min_length=1, max_length=100)
+
+
+class BatchTranslationItem(TranslationResponse):
+    """Translation of one batch item"""
+    status: str  # "translated", "skipped" (nothing to translate / same language) or "failed"
+    error: Optional[str] = None
+
+
+class BatchTranslationResponse(BaseModel):
+    """Batch translation response"""
+    results: List[BatchTranslationItem]
+    translated: int
+    failed: int
@@ -0,0 +1,164 @@
+import asyncio
+from typing import Dict, List
+from uuid import UUID
+
+from sqlalchemy import select, desc, func
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.message import Message, Conversation, ConversationParticipant, TranslationStatusEnum
+from app.models.user import LanguageEnum
+from app.services.message import message_service
+from app.services.mbart_translator.langid import has_translatable_content
+from app.services.translation_scheduler import Priority, SchedulerOverloaded, translation_scheduler
+from app.websocket.manager import manager
+
+
+class LanguageChangeService:
+    """
+    Retranslation of a user's recent history after a `preferred_language` change.
+
+    The most recent messages of the user's most active conversations are
+    translated into the new language, newest first and in batches: the first
+    batch (what is on screen) runs at interactive priority, the rest in the
+    background. Each batch is persisted into `message_translations` and streamed
+    to the user's sockets as `message_translated` events.
+    """
+
+    def __init__(self):
+        # user_id -> running job (a new language change replaces it)
+        self.jobs: Dict[UUID, asyncio.Task] = {}
+
+    def schedule(self, user_id: UUID, language: LanguageEnum) -> None:
+        """Start (or restart) the retranslation job of a user"""
+        previous = self.jobs.pop(user_id, None)
+        if previous is not None:
+            previous.cancel()
+
+        task = asyncio.create_task(self._run(user_id, language))
+        self.jobs[user_id] = task
+
+        def forget(done: asyncio.Task) -> None:
+            if self.jobs.get(user_id) is done:
+                del self.jobs[user_id]
+
+        task.add_done_callback(forget)
+
+    async def stop(self) -> None:
+        """Cancel running jobs"""
+        jobs = list(self.jobs.values())
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        self.jobs = {}
+
+    async def _recent_messages(self, db, user_id: UUID, language: LanguageEnum) -> List[Message]:
+        """Last messages of the user's most recently active conversations, newest first"""
+        conversation_ids = (
+            select(Conversation.id)
+            .join(ConversationParticipant, ConversationParticipant.conversation_id == Conversation.id)
+            .where(ConversationParticipant.user_id == user_id)
+            .order_by(desc(Conversation.updated_at))
+            .limit(settings.TRANSLATION_RETRANSLATE_CONVERSATIONS)
+        )
+
+        rank = func.row_number().over(
+            partition_by=Message.conversation_id,
+            order_by=desc(Message.created_at)
+        ).label("rank")
+        ranked = (
+            select(Message.id, rank)
+            .where(
+                Message.conversation_id.in_(conversation_ids.scalar_subquery()),
+                Message.sender_id != user_id,
+                Message.original_language != language
+            )
+            .subquery()
+        )
+        stmt = (
+            select(Message)
+            .join(ranked, ranked.c.id == Message.id)
+            .where(ranked.c.rank <= settings.TRANSLATION_RETRANSLATE_MESSAGES)
+            .order_by(desc(Message.created_at))
+        )
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def _run(self, user_id: UUID, language: LanguageEnum) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                messages = await self._recent_messages(db, user_id, language)
+
+                # Already translated into this language (e.g. switching back)
+                stored = await message_service.get_translations(db, [m.id for m in messages], language)
+            # The session is closed: no pooled connection held while translating
+
+            messages = [
+                m for m in messages
+                if m.id not in stored
+                and not (m.translated_content and m.target_language == language)
+                and has_translatable_content(m.content)
+            ]
+
+            batch_size = settings.TRANSLATION_RETRANSLATE_BATCH_SIZE
+            for start in range(0, len(messages), batch_size):
+                priority = Priority.INTERACTIVE if start == 0 else Priority.BACKGROUND
+                await self._translate_batch(user_id, language, messages[start:start + batch_size], priority)
+        except SchedulerOverloaded:
+            # The rest is translated on read or by a later language change
+            pass
+        except Exception as e:
+            print(f"Retranslation error ({user_id}): {str(e)}")
+
+    async def _translate_batch(
+        self,
+        user_id: UUID,
+        language: LanguageEnum,
+        messages: List[Message],
+        priority: Priority
+    ) -> None:
+        # Lazy import: the translator is only loaded when needed
+        from app.services.mbart_translator.translation import MBartTranslator
+        translator = await MBartTranslator.get_instance()
+
+        # Concurrent calls share the translator's cache and micro-batches
+        async def translate_all():
+            return await asyncio.gather(*[
+                translator.translate(
+                    m.content,
+                    m.original_language.value,
+                    language.value,
+                    m.tone.value,
+                    detect_source=False
+                )
+                for m in messages
+            ])
+
+        results = await translation_scheduler.run(translate_all, priority, user_id)
+
+        translated = [
+            (m, result["translated_text"])
+            for m, result in zip(messages, results)
+            if result["success"]
+        ]
+
+        async with AsyncSessionLocal() as db:
+            # Messages edited meanwhile keep the translations of their new content
+            unchanged = await message_service.lock_unchanged(db, {m.id: m.content for m, _ in translated})
+            translated = [(m, text) for m, text in translated if m.id in unchanged]
+            await message_service.upsert_translations(db, [
+                (m.id, language, text) for m, text in translated
+            ])
+            await db.commit()
+
+        for m, text in translated:
+            await manager.send_message_translated({
+                "id": str(m.id),
+                "conversation_id": str(m.conversation_id),
+                "translated_content": text,
+                "target_language": language.value,
+                "translation_status": TranslationStatusEnum.TRANSLATED.value,
+            }, user_id)
+
+
+language_change_service = LanguageChangeService()
@@ -0,0 +1,99 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+from .config import Language, Tone
+
+BatchKey = Tuple[Language, Language, Tone]
+BatchHandler = Callable[[List[str], Language, Language, Tone], Awaitable[List[str]]]
+
+
+class TranslationBatcher:
+    """
+    Micro-batching des appels translate() concurrents.
+    Les requêtes arrivant dans une fenêtre de quelques millisecondes sont groupées
+    par (source, cible, tonalité) puis envoyées en un seul appel au fournisseur.
+    Chaque appelant récupère sa propre future.
+    """
+
+    def __init__(self, handler: BatchHandler, max_batch_size: int, max_wait_ms: float):
+        self.handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: Dict[BatchKey, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Compteurs
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, text: str, source: Language, target: Language, tone: Tone) -> str:
+        """Ajoute un texte au lot courant et attend sa traduction"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (source, target, tone)
+
+        group = self._pending.setdefault(key, [])
+        group.append((text, future))
+
+        if len(group) >= self.max_batch_size:
+            self._flush(key)
+        elif len(group) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: BatchKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        # Les appelants annulés entre-temps ne coûtent pas d'appel fournisseur
+        group = [(text, fut) for text, fut in self._pending.pop(key, []) if not fut.done()]
+        if not group:
+            return
+
+        task = asyncio.create_task(self._run(key, group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: BatchKey, group: List[Tuple[str, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(group)
+        self.largest_batch = max(self.largest_batch, len(group))
+
+        try:
+            results = await self.handler([text for text, _ in group], *key)
+            if len(results) != len(group):
+                raise RuntimeError(
+                    f"Batch translation returned {len(results)} results for {len(group)} inputs"
+                )
+        except asyncio.CancelledError:
+            for _, fut in group:
+                fut.cancel()
+            raise
+        except Exception as e:
+            for _, fut in group:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for (_, fut), result in zip(group, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Envoie les lots en attente puis attend leur fin"""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
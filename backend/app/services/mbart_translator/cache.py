@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .utils import normalize_text
+
+# Surcoût approximatif d'une entrée en mémoire (OrderedDict + objets str)
+_ENTRY_OVERHEAD = 120
+
+
+def make_cache_key(text: str, source: str, target: str, tone: str, model: str) -> str:
+    """Clé de cache : hash de (texte normalisé, source, cible, tonalité, modèle)"""
+    raw = "\x1f".join((normalize_text(text), source, target, tone, model))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class MemoryLRU:
+    """
+    LRU en mémoire borné par un budget en octets (et non en nombre d'entrées).
+    Non thread-safe : utilisé uniquement depuis la boucle asyncio.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def _sizeof(key: str, value: str) -> int:
+        return len(key) + len(value.encode("utf-8")) + _ENTRY_OVERHEAD
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        size = self._sizeof(key, value)
+        if size > self.max_bytes:
+            return
+
+        previous = self._data.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= self._sizeof(key, previous)
+
+        self._data[key] = value
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            old_key, old_value = self._data.popitem(last=False)
+            self.current_bytes -= self._sizeof(old_key, old_value)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskStore:
+    """
+    Stockage SQLite partagé par tous les workers uvicorn d'un même hôte.
+    Mode WAL : les lectures ne bloquent jamais, les écritures sont sérialisées par SQLite.
+    """
+
+    def __init__(self, path: str, ttl: int, max_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_created_at ON translations(created_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl and time.time() - created_at > self.ttl:
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._prune()
+
+    def set_many(self, items: List[Tuple[str, str]]) -> None:
+        """Insère un lot sans écraser les entrées existantes (préchargement)"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO translations (key, value, created_at) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items],
+            )
+            self._conn.commit()
+
+    def _prune(self) -> None:
+        """Supprime les entrées expirées puis les plus anciennes au-delà de max_entries"""
+        if self.ttl:
+            self._conn.execute(
+                "DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+        if self.max_entries:
+            self._conn.execute(
+                "DELETE FROM translations WHERE key IN ("
+                " SELECT key FROM translations ORDER BY created_at DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,),
+            )
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationCache:
+    """
+    Cache de traductions à deux niveaux :
+    1. LRU en mémoire (par processus, budget en octets)
+    2. SQLite sur disque (partagé entre les workers de l'hôte)
+    Un hit disque est remonté dans le LRU mémoire.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int,
+        disk_path: Optional[str] = None,
+        ttl: int = 0,
+        max_disk_entries: int = 0,
+    ):
+        self.memory = MemoryLRU(max_memory_bytes)
+        self.disk: Optional[DiskStore] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        if disk_path:
+            try:
+                self.disk = DiskStore(disk_path, ttl, max_disk_entries)
+            except sqlite3.Error as e:
+                print(f"⚠️ Cache disque indisponible ({disk_path}): {e}")
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            try:
+                value = await asyncio.to_thread(self.disk.get, key)
+            except sqlite3.Error:
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        self.writes += 1
+
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, value)
+            except sqlite3.Error as e:
+                print(f"⚠️ Écriture cache disque échouée: {e}")
+
+    async def preload(self, items: List[Tuple[str, str]]) -> None:
+        """
+        Préchargement au démarrage, items du plus au moins utile :
+        insérés en ordre inverse pour que les plus utiles soient les plus
+        récents du LRU. Non comptés dans les écritures.
+        """
+        for key, value in reversed(items):
+            self.memory.set(key, value)
+
+        if self.disk is not None and items:
+            try:
+                await asyncio.to_thread(self.disk.set_many, items)
+            except sqlite3.Error as e:
+                print(f"⚠️ Préchargement cache disque échoué: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs hit/miss/éviction"""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.memory.evictions,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
+        }
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
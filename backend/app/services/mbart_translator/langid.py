@@ -0,0 +1,167 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from .config import Language
+
+# Segments sans rien à traduire
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_EMAIL_RE = re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b")
+_MENTION_RE = re.compile(r"(?<!\w)[@#]\w+")
+_CODE_BLOCK_RE = re.compile(r"```.*?```", re.DOTALL)
+_CODE_SPAN_RE = re.compile(r"`[^`\n]+`")
+_NON_LETTER_RE = re.compile(r"[^\w\s]|[\d_]")
+
+# Écritures identifiables sans modèle
+_KANA_RE = re.compile(r"[぀-ヿ]")
+_HAN_RE = re.compile(r"[一-鿿]")
+_ARABIC_RE = re.compile(r"[؀-ۿ]")
+
+# Corpus d'amorçage (registre conversationnel) pour les profils de trigrammes latins
+_SEED_TEXTS = {
+    Language.EN: (
+        "hello how are you doing today i am fine thank you and you what are you doing "
+        "this weekend we should meet for coffee see you tomorrow at the office "
+        "thanks for your help i will call you later that sounds good to me "
+        "do you want to come with us the meeting is at three in the afternoon "
+        "sorry i was busy i did not see your message have a nice day "
+        "where is the station can you send me the address please let me know "
+        "it was really nice to see you again i think that we have to go now"
+    ),
+    Language.FR: (
+        "bonjour comment ça va aujourd'hui je vais bien merci et toi qu'est-ce que tu fais "
+        "ce week-end on devrait prendre un café à demain au bureau "
+        "merci pour ton aide je t'appelle plus tard ça me va très bien "
+        "est-ce que tu veux venir avec nous la réunion est à trois heures de l'après-midi "
+        "désolé j'étais occupé je n'ai pas vu ton message bonne journée "
+        "où est la gare peux-tu m'envoyer l'adresse s'il te plaît tiens-moi au courant "
+        "c'était vraiment sympa de te revoir je pense qu'il faut qu'on y aille maintenant"
+    ),
+    Language.ES: (
+        "hola cómo estás hoy estoy bien gracias y tú qué vas a hacer "
+        "este fin de semana deberíamos quedar para un café nos vemos mañana en la oficina "
+        "gracias por tu ayuda te llamo más tarde me parece muy bien "
+        "quieres venir con nosotros la reunión es a las tres de la tarde "
+        "lo siento estaba ocupado no vi tu mensaje que tengas un buen día "
+        "dónde está la estación puedes enviarme la dirección por favor avísame "
+        "fue muy bonito verte otra vez creo que tenemos que irnos ahora"
+    ),
+    Language.DE: (
+        "hallo wie geht es dir heute mir geht es gut danke und dir was machst du "
+        "am wochenende wir sollten einen kaffee trinken bis morgen im büro "
+        "danke für deine hilfe ich rufe dich später an das klingt gut für mich "
+        "willst du mit uns kommen das treffen ist um drei uhr am nachmittag "
+        "entschuldigung ich war beschäftigt ich habe deine nachricht nicht gesehen schönen tag noch "
+        "wo ist der bahnhof kannst du mir bitte die adresse schicken sag mir bescheid "
+        "es war wirklich schön dich wiederzusehen ich glaube wir müssen jetzt gehen"
+    ),
+    Language.IT: (
+        "ciao come stai oggi sto bene grazie e tu cosa fai "
+        "questo fine settimana dovremmo prendere un caffè ci vediamo domani in ufficio "
+        "grazie per il tuo aiuto ti chiamo più tardi mi sembra perfetto "
+        "vuoi venire con noi la riunione è alle tre del pomeriggio "
+        "scusa ero occupato non ho visto il tuo messaggio buona giornata "
+        "dov'è la stazione puoi mandarmi l'indirizzo per favore fammi sapere "
+        "è stato davvero bello rivederti penso che dobbiamo andare adesso"
+    ),
+    Language.PT: (
+        "olá como você está hoje eu estou bem obrigado e você o que vai fazer "
+        "neste fim de semana devíamos tomar um café até amanhã no escritório "
+        "obrigado pela sua ajuda eu te ligo mais tarde parece ótimo para mim "
+        "você quer vir conosco a reunião é às três da tarde "
+        "desculpa eu estava ocupado não vi a sua mensagem tenha um bom dia "
+        "onde fica a estação pode me enviar o endereço por favor me avise "
+        "foi muito bom te ver de novo acho que nós temos que ir agora"
+    ),
+}
+
+_profiles: Dict[Language, Tuple[Counter, int]] = {}
+
+# Début du texte analysé : suffisant pour décider, coût borné sur les longs messages
+_SAMPLE_CHARS = 1000
+
+
+def _trigrams(text: str) -> Counter:
+    grams: Counter = Counter()
+    for word in text.split():
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams[padded[i:i + 3]] += 1
+    return grams
+
+
+def _get_profiles() -> Dict[Language, Tuple[Counter, int]]:
+    """Profils construits une seule fois, au premier appel"""
+    if not _profiles:
+        for language, seed in _SEED_TEXTS.items():
+            grams = _trigrams(seed)
+            _profiles[language] = (grams, sum(grams.values()))
+    return _profiles
+
+
+def strip_non_translatable(text: str) -> str:
+    """Retire URLs, e-mails, mentions, code, emojis, chiffres et ponctuation"""
+    text = _CODE_BLOCK_RE.sub(" ", text)
+    text = _CODE_SPAN_RE.sub(" ", text)
+    text = _URL_RE.sub(" ", text)
+    text = _EMAIL_RE.sub(" ", text)
+    text = _MENTION_RE.sub(" ", text)
+    text = _NON_LETTER_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def has_translatable_content(text: str) -> bool:
+    """False pour un message fait uniquement d'emojis, d'URLs, de nombres ou de code"""
+    # Le début du texte suffit presque toujours ; le texte entier sinon
+    if any(ch.isalpha() for ch in strip_non_translatable(text[:_SAMPLE_CHARS])):
+        return True
+    return len(text) > _SAMPLE_CHARS and any(ch.isalpha() for ch in strip_non_translatable(text))
+
+
+def detect_language(text: str, min_letters: int = 12) -> Tuple[Optional[Language], float]:
+    """
+    Identification de langue locale (~1 ms, seuls les _SAMPLE_CHARS premiers
+    caractères sont analysés).
+    Écriture pour le japonais, le chinois et l'arabe ; profils de trigrammes
+    de caractères pour les langues latines.
+    Retourne (langue, confiance) ou (None, 0.0) si le texte est trop court.
+    """
+    content = strip_non_translatable(text[:_SAMPLE_CHARS]).lower()
+    letters = sum(1 for ch in content if ch.isalpha())
+    if letters == 0:
+        return None, 0.0
+
+    # Écritures non latines : décision directe sur la proportion de caractères
+    kana = len(_KANA_RE.findall(content))
+    han = len(_HAN_RE.findall(content))
+    arabic = len(_ARABIC_RE.findall(content))
+    if kana and (kana + han) / letters > 0.5:
+        return Language.JA, 0.99
+    if han / letters > 0.5:
+        return Language.ZH, 0.95
+    if arabic / letters > 0.5:
+        return Language.AR, 0.99
+
+    if letters < min_letters:
+        return None, 0.0
+
+    grams = _trigrams(content)
+    scores: Dict[Language, float] = {}
+    for language, (profile, total) in _get_profiles().items():
+        vocabulary = len(profile) + 1
+        scores[language] = sum(
+            count * math.log((profile.get(gram, 0) + 1) / (total + vocabulary))
+            for gram, count in grams.items()
+        )
+
+    # Softmax sur la log-vraisemblance moyenne par trigramme (stable sur textes longs)
+    n = max(1, sum(grams.values()))
+    best = max(scores.values())
+    weights = {
+        language: math.exp((score - best) / n * 12)
+        for language, score in scores.items()
+    }
+    norm = sum(weights.values())
+    language = max(weights, key=weights.get)
+    return language, weights[language] / norm
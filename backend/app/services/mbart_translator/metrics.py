@@ -0,0 +1,65 @@
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional
+
+
+class LatencyStats:
+    """Fenêtre glissante des dernières latences (en secondes) d'une route"""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.samples:
+            return None
+        return sum(self.samples) / len(self.samples)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.mean),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+        }
+
+
+class LatencyTracker:
+    """Latences par clé, ex. ("provider", "fr", "de") ou ("pivot", "fr", "de")"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._stats: Dict[Hashable, LatencyStats] = {}
+
+    def record(self, key: Hashable, seconds: float) -> None:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = LatencyStats(self.window)
+        stats.record(seconds)
+
+    def get(self, key: Hashable) -> Optional[LatencyStats]:
+        return self._stats.get(key)
+
+    def mean(self, key: Hashable, min_samples: int = 1) -> Optional[float]:
+        """Latence moyenne, ou None si la route n'a pas assez d'échantillons"""
+        stats = self._stats.get(key)
+        if stats is None or len(stats.samples) < min_samples:
+            return None
+        return stats.mean
+
+    def items(self):
+        return self._stats.items()
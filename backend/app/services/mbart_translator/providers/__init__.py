@@ -0,0 +1,35 @@
+from app.core.config import settings
+from .base import TranslationProvider
+
+__all__ = ["TranslationProvider", "create_provider"]
+
+
+def create_provider(name: str) -> TranslationProvider:
+    """
+    Instancie le backend choisi par settings.TRANSLATION_PROVIDER.
+    Import différé : le backend local n'est chargé que s'il est utilisé.
+    """
+    if name == "huggingface":
+        from .hf_api import HFInferenceProvider
+        return HFInferenceProvider()
+    if name == "local":
+        from .local import LocalCPUProvider
+        return LocalCPUProvider()
+    if name == "google":
+        from .google import GoogleTranslateProvider
+        return GoogleTranslateProvider()
+    if name == "deepl":
+        from .deepl import DeepLProvider
+        return DeepLProvider()
+    if name == "router":
+        from .router import ProviderRouter
+        names = [n.strip() for n in settings.TRANSLATION_ROUTER_PROVIDERS.split(",") if n.strip()]
+        return ProviderRouter(
+            [create_provider(n) for n in names if n != "router"],
+            window=settings.TRANSLATION_ROUTER_WINDOW,
+            min_samples=settings.TRANSLATION_ROUTER_MIN_SAMPLES,
+            explore_ratio=settings.TRANSLATION_ROUTER_EXPLORE_RATIO,
+            failure_threshold=settings.TRANSLATION_BREAKER_FAILURES,
+            reset_timeout=settings.TRANSLATION_BREAKER_RESET,
+        )
+    raise ValueError(f"Unknown translation provider: {name!r}")
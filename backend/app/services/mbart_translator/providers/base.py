@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from ..config import Language
+
+
+class TranslationProvider(ABC):
+    """
+    Backend de traduction utilisé par MBartTranslator.
+    Reçoit des lots déjà préparés (tonalité appliquée) de même paire de langues.
+    """
+
+    # Nom utilisé dans TRANSLATION_PROVIDER et dans les métriques
+    name: str = ""
+    # Identifiant du modèle, inclus dans la clé de cache
+    model: str = ""
+
+    @abstractmethod
+    async def translate(
+        self,
+        texts: List[str],
+        source_lang: Language,
+        target_lang: Language
+    ) -> List[str]:
+        """Traduit un lot de textes, résultats dans le même ordre"""
+
+    async def close(self) -> None:
+        """Libère les ressources du backend"""
+
+    def stats(self) -> Optional[Dict]:
+        """Métriques propres au backend (None si aucune)"""
+        return None
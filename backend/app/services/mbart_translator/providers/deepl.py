@@ -0,0 +1,64 @@
+from typing import List
+
+from app.core.config import settings
+from ..config import Language
+from .base import TranslationProvider
+from .http import create_http_client
+
+# DeepL distingue les variantes régionales pour certaines langues cibles
+DEEPL_SOURCE_CODES = {
+    Language.FR: "FR",
+    Language.EN: "EN",
+    Language.ES: "ES",
+    Language.DE: "DE",
+    Language.IT: "IT",
+    Language.PT: "PT",
+    Language.ZH: "ZH",
+    Language.JA: "JA",
+    Language.AR: "AR",
+}
+DEEPL_TARGET_CODES = {
+    **DEEPL_SOURCE_CODES,
+    Language.EN: "EN-US",
+    Language.PT: "PT-PT",
+    Language.ZH: "ZH-HANS",
+}
+
+
+class DeepLProvider(TranslationProvider):
+    """DeepL (API v2, REST), un lot par requête"""
+
+    name = "deepl"
+
+    def __init__(self):
+        self.model = "deepl"
+        self.url = settings.DEEPL_API_URL
+        api_key = settings.DEEPL_API_KEY
+
+        if not api_key:
+            print("⚠️ DEEPL_API_KEY non défini")
+
+        self.client = create_http_client(
+            {"Authorization": f"DeepL-Auth-Key {api_key}"} if api_key else None
+        )
+
+    async def translate(
+        self,
+        texts: List[str],
+        source_lang: Language,
+        target_lang: Language
+    ) -> List[str]:
+        payload = {
+            "text": texts,
+            "source_lang": DEEPL_SOURCE_CODES[source_lang],
+            "target_lang": DEEPL_TARGET_CODES[target_lang],
+        }
+
+        response = await self.client.post(self.url, json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+        return [item["text"] for item in data["translations"]]
+
+    async def close(self) -> None:
+        await self.client.aclose()
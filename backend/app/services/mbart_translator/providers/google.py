@@ -0,0 +1,57 @@
+from typing import List
+
+from app.core.config import settings
+from ..config import Language
+from .base import TranslationProvider
+from .http import create_http_client
+
+# Codes de langue de Google Cloud Translation (API v2)
+GOOGLE_LANG_CODES = {
+    Language.FR: "fr",
+    Language.EN: "en",
+    Language.ES: "es",
+    Language.DE: "de",
+    Language.IT: "it",
+    Language.PT: "pt",
+    Language.ZH: "zh-CN",
+    Language.JA: "ja",
+    Language.AR: "ar",
+}
+
+
+class GoogleTranslateProvider(TranslationProvider):
+    """Google Cloud Translation (API v2, REST), un lot par requête"""
+
+    name = "google"
+
+    def __init__(self):
+        self.model = "google:nmt"
+        self.url = settings.GOOGLE_TRANSLATE_URL
+        self.api_key = settings.GOOGLE_TRANSLATE_API_KEY
+
+        if not self.api_key:
+            print("⚠️ GOOGLE_TRANSLATE_API_KEY non défini")
+
+        self.client = create_http_client()
+
+    async def translate(
+        self,
+        texts: List[str],
+        source_lang: Language,
+        target_lang: Language
+    ) -> List[str]:
+        payload = {
+            "q": texts,
+            "source": GOOGLE_LANG_CODES[source_lang],
+            "target": GOOGLE_LANG_CODES[target_lang],
+            "format": "text",
+        }
+
+        response = await self.client.post(self.url, params={"key": self.api_key}, json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+        return [item["translatedText"] for item in data["data"]["translations"]]
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,88 @@
+import os
+from typing import Any, List, Optional
+
+from app.core.config import settings
+from ..config import Language, HF_LANG_CODES, DEFAULT_MODEL
+from .base import TranslationProvider
+from .http import create_http_client
+
+
+class HFInferenceClient:
+    """
+    Client HTTP asynchrone pour l'API d'inférence Hugging Face.
+    Un seul httpx.AsyncClient par processus : connexions keep-alive réutilisées,
+    HTTP/2 si disponible, aucun thread consommé par appel.
+    """
+
+    def __init__(self, api_key: Optional[str], model: str, base_url: str):
+        # "org/model:fastest" -> "org/model" (le suffixe sert au routage du SDK HF)
+        self.model_id = model.split(":", 1)[0]
+        self.url = f"{base_url.rstrip('/')}/{self.model_id}"
+
+        headers = {}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        self._client = create_http_client(headers)
+
+    async def translate(self, texts: List[str], src_lang: str, tgt_lang: str) -> List[str]:
+        """Traduit un lot de textes en une seule requête HTTP"""
+        payload = {
+            "inputs": texts if len(texts) > 1 else texts[0],
+            "parameters": {"src_lang": src_lang, "tgt_lang": tgt_lang},
+        }
+
+        response = await self._client.post(self.url, json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+        if isinstance(data, dict) and "error" in data:
+            raise RuntimeError(f"Hugging Face API error: {data['error']}")
+
+        return [self._extract_text(item) for item in data]
+
+    @staticmethod
+    def _extract_text(item: Any) -> str:
+        # Selon le modèle : {"translation_text": ...} ou [{"translation_text": ...}]
+        if isinstance(item, list):
+            item = item[0]
+        return item["translation_text"]
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class HFInferenceProvider(TranslationProvider):
+    """mBART-50 via l'API d'inférence Hugging Face (modèle chargé côté HF)"""
+
+    name = "huggingface"
+
+    def __init__(self):
+        self.model = DEFAULT_MODEL
+        api_key = os.environ.get("HF_TOKEN")
+
+        if not api_key:
+            print("⚠️ HF_TOKEN non trouvé dans les variables d'environnement")
+            print("💡 Ajoutez votre token Hugging Face dans les secrets Leapcell")
+
+        # Client HTTP asynchrone (pool de connexions keep-alive, HTTP/2)
+        self.client = HFInferenceClient(
+            api_key=api_key,
+            model=self.model,
+            base_url=settings.HF_INFERENCE_URL,
+        )
+
+    async def translate(
+        self,
+        texts: List[str],
+        source_lang: Language,
+        target_lang: Language
+    ) -> List[str]:
+        return await self.client.translate(
+            texts,
+            src_lang=HF_LANG_CODES[source_lang],
+            tgt_lang=HF_LANG_CODES[target_lang],
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
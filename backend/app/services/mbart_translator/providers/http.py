@@ -0,0 +1,29 @@
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+
+def create_http_client(headers: Optional[Dict[str, str]] = None) -> httpx.AsyncClient:
+    """
+    Client HTTP asynchrone partagé par les backends distants :
+    connexions keep-alive réutilisées, HTTP/2 si le paquet h2 est installé.
+    """
+    timeout = httpx.Timeout(
+        settings.TRANSLATION_READ_TIMEOUT,
+        connect=settings.TRANSLATION_CONNECT_TIMEOUT
+    )
+    limits = httpx.Limits(
+        max_connections=settings.TRANSLATION_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.TRANSLATION_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+    try:
+        return httpx.AsyncClient(
+            headers=headers, timeout=timeout, limits=limits, http2=settings.TRANSLATION_HTTP2
+        )
+    except ImportError:
+        # Le paquet h2 n'est pas installé : repli sur HTTP/1.1
+        print("⚠️ HTTP/2 indisponible (paquet h2 manquant), utilisation de HTTP/1.1")
+        return httpx.AsyncClient(headers=headers, timeout=timeout, limits=limits)
@@ -0,0 +1,108 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from app.core.config import settings
+from ..config import Language, HF_LANG_CODES
+from .base import TranslationProvider
+
+# État propre à chaque processus du pool (chargé une seule fois par processus)
+_translator = None
+_tokenizer = None
+
+
+def _init_worker(model_path: str, tokenizer_name: str, compute_type: str, threads: int) -> None:
+    """Charge le modèle quantifié et le tokenizer dans le processus worker"""
+    global _translator, _tokenizer
+
+    # Dépendances optionnelles : uniquement requises pour TRANSLATION_PROVIDER=local
+    import ctranslate2
+    from transformers import AutoTokenizer
+
+    _translator = ctranslate2.Translator(
+        model_path,
+        device="cpu",
+        compute_type=compute_type,
+        intra_threads=threads,
+    )
+    _tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+
+def _translate_in_worker(
+    texts: List[str],
+    src_code: str,
+    tgt_code: str,
+    beam_size: int,
+    max_length: int
+) -> List[str]:
+    """Inférence par lot dans le processus worker"""
+    _tokenizer.src_lang = src_code
+    sources = [
+        _tokenizer.convert_ids_to_tokens(_tokenizer.encode(text))
+        for text in texts
+    ]
+
+    results = _translator.translate_batch(
+        sources,
+        target_prefix=[[tgt_code]] * len(sources),
+        beam_size=beam_size,
+        max_decoding_length=max_length,
+    )
+
+    # Le premier token est le code de langue cible imposé par target_prefix
+    return [
+        _tokenizer.decode(
+            _tokenizer.convert_tokens_to_ids(result.hypotheses[0][1:]),
+            skip_special_tokens=True,
+        )
+        for result in results
+    ]
+
+
+class LocalCPUProvider(TranslationProvider):
+    """
+    mBART-50 quantifié int8 (CTranslate2) exécuté sur nos propres cœurs.
+    Chaque lot du micro-batcher devient un appel translate_batch dans un
+    processus du pool : pas de coût réseau, latence prévisible.
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.model = f"local:{settings.LOCAL_TRANSLATION_MODEL_PATH}:{settings.LOCAL_TRANSLATION_COMPUTE_TYPE}"
+        self.beam_size = settings.LOCAL_TRANSLATION_BEAM_SIZE
+        self.max_length = settings.LOCAL_TRANSLATION_MAX_LENGTH
+
+        # "spawn" : ne pas dupliquer la boucle asyncio du processus parent
+        self._pool = ProcessPoolExecutor(
+            max_workers=settings.LOCAL_TRANSLATION_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                settings.LOCAL_TRANSLATION_MODEL_PATH,
+                settings.LOCAL_TRANSLATION_TOKENIZER,
+                settings.LOCAL_TRANSLATION_COMPUTE_TYPE,
+                settings.LOCAL_TRANSLATION_THREADS,
+            ),
+        )
+
+    async def translate(
+        self,
+        texts: List[str],
+        source_lang: Language,
+        target_lang: Language
+    ) -> List[str]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool,
+            _translate_in_worker,
+            texts,
+            HF_LANG_CODES[source_lang],
+            HF_LANG_CODES[target_lang],
+            self.beam_size,
+            self.max_length,
+        )
+
+    async def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,164 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..config import Language
+from ..metrics import LatencyStats
+from ..resilience import CircuitBreaker, CircuitOpenError
+from .base import TranslationProvider
+
+RouteKey = Tuple[str, Language, Language]
+
+
+class _RouteStats:
+    """Latences et taux d'erreur glissants d'un backend pour une paire de langues"""
+
+    def __init__(self, window: int):
+        self.latency = LatencyStats(window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)  # True = échec
+        self.errors = 0
+
+    def record(self, seconds: Optional[float], failed: bool) -> None:
+        self.outcomes.append(failed)
+        if failed:
+            self.errors += 1
+        elif seconds is not None:
+            self.latency.record(seconds)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(self.outcomes) / len(self.outcomes)
+
+    def summary(self) -> Dict:
+        return {
+            **self.latency.summary(),
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 3),
+        }
+
+
+class ProviderRouter(TranslationProvider):
+    """
+    Aiguillage entre plusieurs backends.
+    Chaque lot part vers le backend sain le plus rapide pour sa paire de langues
+    (p95 glissant pénalisé par le taux d'erreur) ; en cas d'échec, le suivant
+    est essayé. Les backends sans assez de mesures sont explorés en priorité,
+    et une petite part du trafic continue d'explorer les autres pour détecter
+    leur rétablissement.
+    """
+
+    name = "router"
+
+    def __init__(
+        self,
+        providers: List[TranslationProvider],
+        window: int = 100,
+        min_samples: int = 5,
+        explore_ratio: float = 0.05,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        if not providers:
+            raise ValueError("ProviderRouter needs at least one provider")
+
+        self.providers = providers
+        # Même clé de cache quel que soit le backend qui a répondu
+        self.model = "router:" + "+".join(p.model for p in providers)
+        self.window = window
+        self.min_samples = min_samples
+        self.explore_ratio = explore_ratio
+
+        self.breakers: Dict[str, CircuitBreaker] = {
+            p.name: CircuitBreaker(failure_threshold, reset_timeout) for p in providers
+        }
+        self.routes: Dict[RouteKey, _RouteStats] = {}
+        self.chosen: Dict[str, int] = {p.name: 0 for p in providers}
+
+    def _route(self, provider: TranslationProvider, source: Language, target: Language) -> _RouteStats:
+        key = (provider.name, source, target)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = _RouteStats(self.window)
+        return stats
+
+    def _score(self, provider: TranslationProvider, source: Language, target: Language) -> float:
+        """Temps attendu avant une réponse réussie (0 = pas encore mesuré)"""
+        stats = self._route(provider, source, target)
+        if len(stats.outcomes) < self.min_samples:
+            return 0.0
+        p95 = stats.latency.percentile(95)
+        if p95 is None:
+            # Uniquement des échecs récents
+            return float("inf")
+        return p95 / max(0.05, 1.0 - stats.error_rate)
+
+    def rank(self, source: Language, target: Language) -> List[TranslationProvider]:
+        """Backends disponibles, du plus au moins rapide pour la paire"""
+        available = [p for p in self.providers if self.breakers[p.name].is_available]
+        # sorted() est stable : à score égal, l'ordre de configuration est conservé
+        ranked = sorted(available, key=lambda p: self._score(p, source, target))
+
+        if len(ranked) > 1 and random.random() < self.explore_ratio:
+            explored = ranked.pop(random.randrange(1, len(ranked)))
+            ranked.insert(0, explored)
+        return ranked
+
+    async def translate(
+        self,
+        texts: List[str],
+        source_lang: Language,
+        target_lang: Language
+    ) -> List[str]:
+        ranked = self.rank(source_lang, target_lang)
+        if not ranked:
+            raise CircuitOpenError("All translation providers unavailable (circuits open)")
+
+        error: Optional[Exception] = None
+        for provider in ranked:
+            breaker = self.breakers[provider.name]
+            try:
+                breaker.before_call()
+            except CircuitOpenError as e:
+                error = e
+                continue
+
+            stats = self._route(provider, source_lang, target_lang)
+            start = time.perf_counter()
+            try:
+                results = await provider.translate(texts, source_lang, target_lang)
+            except asyncio.CancelledError:
+                breaker.record_cancelled()
+                raise
+            except Exception as e:
+                breaker.record_failure()
+                stats.record(None, failed=True)
+                print(f"⚠️ Backend {provider.name} en échec ({source_lang.value}->{target_lang.value}): {e}")
+                error = e
+                continue
+
+            breaker.record_success()
+            stats.record(time.perf_counter() - start, failed=False)
+            self.chosen[provider.name] += 1
+            return results
+
+        raise error
+
+    def stats(self) -> Dict:
+        pairs: Dict[str, Dict] = {}
+        for (name, source, target), stats in self.routes.items():
+            pairs.setdefault(f"{source.value}->{target.value}", {})[name] = stats.summary()
+        return {
+            "providers": {
+                p.name: {**self.breakers[p.name].stats(), "chosen": self.chosen[p.name]}
+                for p in self.providers
+            },
+            "pairs": pairs,
+        }
+
+    async def close(self) -> None:
+        for provider in self.providers:
+            await provider.close()
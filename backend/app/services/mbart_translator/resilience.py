@@ -0,0 +1,198 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Le backend est considéré indisponible : échec immédiat sans appel"""
+
+
+class DeadlineExceeded(Exception):
+    """L'échéance de la requête appelante est dépassée"""
+
+
+# Échéance absolue (time.monotonic()) de la requête en cours, propagée aux sous-tâches
+_deadline: ContextVar[Optional[float]] = ContextVar("translation_deadline", default=None)
+
+
+@contextmanager
+def deadline_at(when: Optional[float]):
+    """Fixe une échéance absolue ; une échéance englobante plus courte est conservée"""
+    if when is None:
+        yield
+        return
+    current = _deadline.get()
+    token = _deadline.set(when if current is None else min(current, when))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def deadline(seconds: Optional[float]):
+    """Fixe une échéance relative (en secondes) pour le bloc"""
+    return deadline_at(time.monotonic() + seconds if seconds is not None else None)
+
+
+@contextmanager
+def shared_deadline(seconds: Optional[float]):
+    """
+    Budget propre d'un appel partagé (lot, requête dédupliquée) : remplace
+    l'échéance héritée de l'appelant qui l'a lancé, chaque appelant n'appliquant
+    la sienne qu'à sa propre attente
+    """
+    token = _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """Temps restant avant l'échéance courante, None si aucune"""
+    when = _deadline.get()
+    if when is None:
+        return None
+    return when - time.monotonic()
+
+
+async def within_deadline(awaitable: Awaitable[Any]) -> Any:
+    """Attend le résultat sans dépasser l'échéance courante"""
+    left = time_left()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Translation deadline exceeded")
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Translation deadline exceeded") from None
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un backend de traduction.
+    closed : appels normaux ; après failure_threshold échecs consécutifs -> open.
+    open : échec immédiat pendant reset_timeout secondes -> half_open.
+    half_open : un seul appel de test ; succès -> closed, échec -> open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+        # Compteurs
+        self.opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        """Lève CircuitOpenError si l'appel doit échouer immédiatement"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError("Translation provider unavailable (circuit open)")
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError("Translation provider unavailable (probe in progress)")
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def record_cancelled(self) -> None:
+        """Appel abandonné (appelant annulé, requête doublée) : ni succès ni échec"""
+        self._probing = False
+
+    @property
+    def is_available(self) -> bool:
+        """Vrai si un appel serait tenté maintenant (sans changer l'état)"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return not (self.state == self.HALF_OPEN and self._probing)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class HedgeStats:
+    """Compteurs des requêtes doublées"""
+
+    def __init__(self):
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hedged": self.hedged, "hedge_wins": self.hedge_wins}
+
+
+async def hedged(
+    call: Callable[[], Awaitable[Any]],
+    delay: Optional[float],
+    stats: Optional[HedgeStats] = None
+) -> Any:
+    """
+    Lance call() ; s'il n'a pas répondu après delay secondes, lance un second
+    appel identique et retourne la première réponse réussie. L'autre est annulé.
+    """
+    first = asyncio.ensure_future(call())
+    if delay is None:
+        return await first
+
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+    except asyncio.CancelledError:
+        first.cancel()
+        raise
+    if done:
+        return first.result()
+
+    second = asyncio.ensure_future(call())
+    if stats is not None:
+        stats.hedged += 1
+
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second and stats is not None:
+                        stats.hedge_wins += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,124 @@
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Tuple
+
+# Fin de phrase : ponctuation latine suivie d'un espace, ponctuation CJK, ou saut de ligne
+_END_RE = re.compile(r'[.!?…]+["\'”’»)\]]*(?=\s)|[。！？]+["\'”’»」』)\]]*|\n')
+
+# (texte du segment, espaces qui le suivent dans le message d'origine)
+Segment = Tuple[str, str]
+
+
+def _is_boundary(text: str, end: int) -> bool:
+    """Évite de couper après une abréviation : "M. dupont", "etc. et", "e.g. this" """
+    pos = end
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos >= len(text) or not text[pos].islower()
+
+
+def _split_long(segment: str, max_length: int) -> List[Segment]:
+    """Coupe un segment trop long au dernier espace avant max_length"""
+    pieces: List[Segment] = []
+    while len(segment) > max_length:
+        cut = segment.rfind(" ", 0, max_length)
+        if cut <= 0:
+            cut = max_length
+        head, segment = segment[:cut], segment[cut:]
+        stripped = segment.lstrip()
+        pieces.append((head, segment[:len(segment) - len(stripped)]))
+        segment = stripped
+    if segment:
+        pieces.append((segment, ""))
+    return pieces
+
+
+def split_segments(text: str, max_length: int = 0) -> Tuple[str, List[Segment]]:
+    """
+    Découpe un texte en phrases.
+    Retourne (espaces de tête, [(phrase, espaces suivants), ...]) de sorte que
+    join_segments(...) reconstruise exactement le texte d'origine.
+    Si max_length > 0, les phrases plus longues sont redécoupées aux espaces.
+    """
+    stripped = text.lstrip()
+    prefix = text[:len(text) - len(stripped)]
+    text = stripped
+
+    segments: List[Segment] = []
+    start = 0
+    search_from = 0
+
+    while True:
+        match = _END_RE.search(text, search_from)
+        if match is None:
+            break
+
+        end = match.start() if match.group() == "\n" else match.end()
+        if match.group() != "\n" and not _is_boundary(text, end):
+            search_from = match.end()
+            continue
+
+        ws_end = end
+        while ws_end < len(text) and text[ws_end].isspace():
+            ws_end += 1
+
+        if end > start:
+            segments.append((text[start:end], text[end:ws_end]))
+        elif segments:
+            # Lignes vides successives : on rattache les espaces au segment précédent
+            last, ws = segments[-1]
+            segments[-1] = (last, ws + text[end:ws_end])
+
+        start = search_from = ws_end
+        if start >= len(text):
+            break
+
+    if start < len(text):
+        rest = text[start:]
+        core = rest.rstrip()
+        segments.append((core, rest[len(core):]))
+
+    if max_length > 0:
+        resized: List[Segment] = []
+        for segment, ws in segments:
+            if len(segment) > max_length:
+                pieces = _split_long(segment, max_length)
+                last, last_ws = pieces[-1]
+                pieces[-1] = (last, last_ws + ws)
+                resized.extend(pieces)
+            else:
+                resized.append((segment, ws))
+        segments = resized
+
+    return prefix, segments
+
+
+def join_segments(prefix: str, segments: List[Segment]) -> str:
+    """Reconstruit le texte à partir des segments (traduits ou non)"""
+    return prefix + "".join(segment + ws for segment, ws in segments)
+
+
+def diff_segments(old: str, new: str) -> List[Dict[str, Any]]:
+    """
+    Différence phrase à phrase entre deux versions d'un texte, exprimée en
+    opérations sur les caractères de l'ancienne version :
+    [{"start": début, "end": fin, "text": remplacement}, ...] (ordre croissant).
+    Appliquées de la dernière à la première, elles transforment old en new.
+    """
+    def pieces(text: str) -> List[str]:
+        prefix, segments = split_segments(text)
+        return ([prefix] if prefix else []) + [segment + ws for segment, ws in segments]
+
+    old_pieces = pieces(old)
+    new_pieces = pieces(new)
+
+    offsets = [0]
+    for piece in old_pieces:
+        offsets.append(offsets[-1] + len(piece))
+
+    matcher = SequenceMatcher(None, old_pieces, new_pieces, autojunk=False)
+    return [
+        {"start": offsets[i1], "end": offsets[i2], "text": "".join(new_pieces[j1:j2])}
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
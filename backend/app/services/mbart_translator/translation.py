@@ -1,32 +1,75 @@
-import os
 import asyncio
-from typing import Optional, Dict, List, Union
-from huggingface_hub import InferenceClient
-from .config import Language, Tone, HF_LANG_CODES, TONE_PARAMS, DEFAULT_MODEL
+import time
+from typing import Awaitable, Callable, Optional, Dict, Iterable, List, Set, Union
+from app.core.config import settings
+from .config import Language, Tone, TONE_PARAMS
+from .providers import TranslationProvider, create_provider
+from .cache import TranslationCache, make_cache_key
+from .batching import TranslationBatcher
+from .singleflight import SingleFlight
+from .metrics import LatencyTracker
+from .segmentation import split_segments, join_segments
+from .langid import detect_language, has_translatable_content
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    HedgeStats,
+    deadline,
+    hedged,
+    shared_deadline,
+    within_deadline,
+)
+
+# Appelé à chaque phrase traduite : (langue cible, index, total, texte à concaténer)
+SegmentCallback = Callable[[str, int, int, str], Awaitable[None]]
 
 class MBartTranslator:
     """
-    Traducteur basé sur l'API d'inférence Hugging Face.
-    Ultra-léger car le modèle est chargé côté HF.
+    Traducteur mBART-50.
+    Le backend (API Hugging Face, CPU local, Google, DeepL ou aiguillage
+    entre plusieurs d'entre eux) est choisi par settings.TRANSLATION_PROVIDER ;
+    cache, batching et déduplication sont communs à tous les backends.
     """
 
     _instance: Optional['MBartTranslator'] = None
     _lock = asyncio.Lock()
 
-    def __init__(self):
-        """Initialisation légère - pas de chargement de modèle"""
-        self.client = None
-        self.model = DEFAULT_MODEL
-        self.api_key = os.environ.get("HF_TOKEN")
-        
-        if not self.api_key:
-            print("⚠️ HF_TOKEN non trouvé dans les variables d'environnement")
-            print("💡 Ajoutez votre token Hugging Face dans les secrets Leapcell")
-        
-        self.client = InferenceClient(
-            provider="auto",
-            api_key=self.api_key
+    def __init__(self, provider: Optional[TranslationProvider] = None):
+        """Initialisation légère - le backend local charge son modèle dans ses propres processus"""
+        self.provider = provider or create_provider(settings.TRANSLATION_PROVIDER)
+        self.model = self.provider.model
+
+        # Cache mémoire + disque partagé entre workers
+        self.cache: Optional[TranslationCache] = None
+        if settings.TRANSLATION_CACHE_ENABLED:
+            self.cache = TranslationCache(
+                max_memory_bytes=settings.TRANSLATION_CACHE_MEMORY_BYTES,
+                disk_path=settings.TRANSLATION_CACHE_PATH,
+                ttl=settings.TRANSLATION_CACHE_TTL,
+                max_disk_entries=settings.TRANSLATION_CACHE_MAX_DISK_ENTRIES,
+            )
+
+        # Regroupe les appels concurrents par (source, cible, tonalité)
+        self.batcher = TranslationBatcher(
+            self._translate_batch,
+            max_batch_size=settings.TRANSLATION_BATCH_MAX_SIZE,
+            max_wait_ms=settings.TRANSLATION_BATCH_MAX_WAIT_MS,
+        )
+
+        # Déduplication des traductions identiques en vol
+        self.inflight = SingleFlight()
+
+        # Latences par route : ("provider" | "direct" | "pivot", source, cible)
+        self.latency = LatencyTracker()
+        self.pivot_lang = Language(settings.TRANSLATION_PIVOT_LANGUAGE)
+
+        # Échec immédiat quand le backend est en panne, requêtes doublées au-delà du p95
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.TRANSLATION_BREAKER_FAILURES,
+            reset_timeout=settings.TRANSLATION_BREAKER_RESET,
         )
+        self.hedge_stats = HedgeStats()
 
     @classmethod
     async def get_instance(cls) -> 'MBartTranslator':
@@ -51,80 +94,400 @@ class MBartTranslator:
             text = text[len(params["prepend"]):]
         return text.strip()
 
-    async def translate(
+    async def _translate_batch(
+        self,
+        texts: List[str],
+        source_lang: Language,
+        target_lang: Language,
+        tone: Tone
+    ) -> List[str]:
+        """
+        Traduit un lot de textes de même (source, cible, tonalité)
+        en un seul appel au backend.
+        """
+        prepared = [self._prepare_text(text, tone) for text in texts]
+        key = ("provider", source_lang.value, target_lang.value)
+
+        # Disjoncteur ouvert : aucun appel, les appelants échouent tout de suite
+        self.breaker.before_call()
+
+        start = time.perf_counter()
+        try:
+            # Le lot sert plusieurs appelants : budget propre, pas l'échéance
+            # de celui qui l'a ouvert (chacun applique la sienne en attendant)
+            with shared_deadline(settings.TRANSLATION_DEADLINE):
+                results = await within_deadline(hedged(
+                    lambda: self.provider.translate(prepared, source_lang, target_lang),
+                    self._hedge_delay(key),
+                    self.hedge_stats
+                ))
+        except (asyncio.CancelledError, CircuitOpenError):
+            # Abandon ou aiguilleur sans backend disponible : ni succès ni échec
+            self.breaker.record_cancelled()
+            raise
+        except DeadlineExceeded:
+            # Le lot a épuisé son propre budget : backend bloqué, compté comme échec
+            self.breaker.record_failure()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self.latency.record(key, time.perf_counter() - start)
+
+        return [self._postprocess_text(result, tone) for result in results]
+
+    def _hedge_delay(self, key) -> Optional[float]:
+        """Délai avant la requête doublée : p95 observé de la paire (None = pas de doublage)"""
+        if not settings.TRANSLATION_HEDGE_ENABLED:
+            return None
+        stats = self.latency.get(key)
+        if stats is None or len(stats.samples) < settings.TRANSLATION_HEDGE_MIN_SAMPLES:
+            return None
+        return stats.percentile(95)
+
+    async def _translate_and_store(
+        self,
+        cache_key: str,
+        text: str,
+        source_lang: Language,
+        target_lang: Language,
+        tone: Tone
+    ) -> str:
+        """Traduit via le micro-batcher puis alimente le cache"""
+        translated = await self.batcher.submit(text, source_lang, target_lang, tone)
+        if self.cache is not None:
+            await self.cache.set(cache_key, translated)
+        return translated
+
+    async def _translate_unit(
         self,
         text: str,
+        source_lang: Language,
+        target_lang: Language,
+        tone: Tone,
+        hints: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Traduit un texte court (une phrase) : traductions connues de l'appelant
+        (hints), cache, puis déduplication et micro-batching.
+        Lève une exception en cas d'échec du backend.
+        """
+        if source_lang == target_lang:
+            return text
+
+        # Cache (texte normalisé, source, cible, tonalité, modèle)
+        cache_key = make_cache_key(
+            text, source_lang.value, target_lang.value, tone.value, self.model
+        )
+        if hints and cache_key in hints:
+            return hints[cache_key]
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Une seule traduction en vol par clé, envoyée via le micro-batcher ;
+        # l'appelant n'attend pas au-delà de son échéance
+        return await within_deadline(self.inflight.do(
+            cache_key,
+            lambda: self._translate_and_store(
+                cache_key, text, source_lang, target_lang, tone
+            )
+        ))
+
+    async def _translate_text(
+        self,
+        text: str,
+        source_lang: Language,
+        target_lang: Language,
+        tone: Tone,
+        max_length: int = 200,
+        on_segment: Optional[SegmentCallback] = None,
+        hints: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Traduit un texte de longueur quelconque.
+        Au-delà de max_length, le texte est découpé en phrases traduites
+        concurremment (même lot fournisseur) et mises en cache une par une :
+        un message édité ou cité ne retraduit que les phrases modifiées.
+        on_segment est notifié dès qu'une phrase est prête (livraison progressive).
+        """
+        if source_lang == target_lang or len(text) <= max_length:
+            return await self._translate_unit(text, source_lang, target_lang, tone, hints)
+
+        prefix, segments = split_segments(text, max_length)
+        if len(segments) <= 1:
+            return await self._translate_unit(text, source_lang, target_lang, tone, hints)
+
+        async def translate_segment(index: int, segment: str, ws: str) -> str:
+            part = await self._translate_unit(segment, source_lang, target_lang, tone, hints)
+            if on_segment is not None:
+                chunk = (prefix if index == 0 else "") + part + ws
+                try:
+                    await on_segment(target_lang.value, index, len(segments), chunk)
+                except Exception as e:
+                    print(f"⚠️ Notification de progression échouée: {e}")
+            return part
+
+        translated = await asyncio.gather(*[
+            translate_segment(index, segment, ws)
+            for index, (segment, ws) in enumerate(segments)
+        ])
+        return join_segments(
+            prefix,
+            [(part, ws) for part, (_, ws) in zip(translated, segments)]
+        )
+
+    def edit_hints(
+        self,
+        text: str,
+        translation: str,
         source_lang: Union[str, Language],
         target_lang: Union[str, Language],
         tone: Union[str, Tone] = Tone.STANDARD,
         max_length: int = 200
+    ) -> Dict[str, str]:
+        """
+        Traductions phrase par phrase déduites d'une traduction déjà connue
+        (ancienne version d'un message édité), à passer en hints à translate_many.
+        Les phrases ne sont associées que si texte et traduction ont le même
+        nombre de phrases ; l'association n'étant pas garantie, elle ne sert
+        qu'à cette édition et n'est jamais écrite dans le cache partagé.
+        """
+        source_lang = Language(source_lang)
+        target_lang = Language(target_lang)
+        tone = Tone(tone)
+
+        # Même découpage que _translate_text
+        if len(text) <= max_length:
+            pairs = [(text, translation)]
+        else:
+            _, segments = split_segments(text, max_length)
+            _, translated = split_segments(translation)
+            if len(segments) != len(translated):
+                return {}
+            pairs = [(segment, part) for (segment, _), (part, _) in zip(segments, translated)]
+
+        return {
+            make_cache_key(segment, source_lang.value, target_lang.value, tone.value, self.model): part
+            for segment, part in pairs
+        }
+
+    @staticmethod
+    def _detect_source(text: str, source_lang: Language) -> Language:
+        """Corrige la langue source déclarée si l'identification locale est sûre d'elle"""
+        if not settings.TRANSLATION_LANGID_ENABLED:
+            return source_lang
+        detected, confidence = detect_language(text, settings.TRANSLATION_LANGID_MIN_LETTERS)
+        if detected is not None and confidence >= settings.TRANSLATION_LANGID_MIN_CONFIDENCE:
+            return detected
+        return source_lang
+
+    @staticmethod
+    def _result(
+        text: str,
+        source_lang: Language,
+        target_lang: Language,
+        tone: Tone,
+        confidence: float = 0.95
+    ) -> Dict:
+        return {
+            "success": True,
+            "translated_text": text,
+            "source_lang": source_lang.value,
+            "target_lang": target_lang.value,
+            "tone": tone.value,
+            "confidence": confidence
+        }
+
+    @staticmethod
+    def _error(
+        text: str,
+        source_lang: Language,
+        target_lang: Language,
+        tone: Tone,
+        error: Exception
+    ) -> Dict:
+        return {
+            "success": False,
+            "translated_text": text,
+            "source_lang": source_lang.value,
+            "target_lang": target_lang.value,
+            "tone": tone.value,
+            "error": str(error)
+        }
+
+    async def translate(
+        self,
+        text: str,
+        source_lang: Union[str, Language],
+        target_lang: Union[str, Language],
+        tone: Union[str, Tone] = Tone.STANDARD,
+        max_length: int = 200,
+        on_segment: Optional[SegmentCallback] = None,
+        detect_source: bool = True
     ) -> Dict:
         """
-        Traduit le texte via l'API Hugging Face.
-        Ultra-rapide et sans consommation de mémoire locale.
+        Traduit le texte via le backend configuré.
+        Cache, déduplication et micro-batching avant tout appel au backend.
+        detect_source : False quand la langue source a déjà été identifiée (à l'envoi).
         """
         # Gestion des types
-        if isinstance(source_lang, str):
-            source_lang = Language(source_lang)
-        if isinstance(target_lang, str):
-            target_lang = Language(target_lang)
-        if isinstance(tone, str):
-            tone = Tone(tone)
-
-        # Si même langue, retour direct
+        source_lang = Language(source_lang)
+        target_lang = Language(target_lang)
+        tone = Tone(tone)
+
+        # Rien à traduire (emojis, URLs, nombres, code) : aucun appel fournisseur
+        if not has_translatable_content(text):
+            result = self._result(text, source_lang, target_lang, tone, confidence=1.0)
+            result["skipped"] = "non_translatable"
+            return result
+
+        if detect_source:
+            source_lang = self._detect_source(text, source_lang)
+
+        # Si même langue (déclarée ou détectée), retour direct
         if source_lang == target_lang:
-            return {
-                "success": True,
-                "translated_text": text,
-                "source_lang": source_lang.value,
-                "target_lang": target_lang.value,
-                "tone": tone.value,
-                "confidence": 1.0
-            }
+            return self._result(text, source_lang, target_lang, tone, confidence=1.0)
 
         try:
-            # Préparation du texte selon la tonalité
-            prepared_text = self._prepare_text(text, tone)
-            
-            # Appel API (dans un thread pool pour ne pas bloquer)
-            loop = asyncio.get_running_loop()
-            
-            def translate_sync():
-                return self.client.translation(
-                    prepared_text,
-                    model=self.model,
-                    # Optionnel: spécifier les langues si nécessaire
-                    # parameters={"src_lang": HF_LANG_CODES[source_lang]},
+            with deadline(settings.TRANSLATION_DEADLINE):
+                translated = await self._translate_text(
+                    text, source_lang, target_lang, tone, max_length, on_segment
                 )
+            return self._result(translated, source_lang, target_lang, tone)
+        except Exception as e:
+            return self._error(text, source_lang, target_lang, tone, e)
 
-            result = await loop.run_in_executor(None, translate_sync)
-            
-            # Post-traitement
-            translated = self._postprocess_text(result, tone)
+    def _pivot_targets(self, source_lang: Language, targets: List[Language]) -> Set[Language]:
+        """
+        Cibles pour lesquelles passer par la langue pivot coûte moins cher
+        que la paire directe, d'après les latences observées du backend.
+        Sans statistiques suffisantes, la paire directe est conservée.
+        """
+        pivot = self.pivot_lang
+        if not settings.TRANSLATION_PIVOT_ENABLED or source_lang == pivot:
+            return set()
 
-            return {
-                "success": True,
-                "translated_text": translated,
-                "source_lang": source_lang.value,
-                "target_lang": target_lang.value,
-                "tone": tone.value,
-                "confidence": 0.95
-            }
+        candidates = [t for t in targets if t not in (pivot, source_lang)]
+        if not candidates:
+            return set()
 
-        except Exception as e:
-            return {
-                "success": False,
-                "translated_text": text,
-                "source_lang": source_lang.value,
-                "target_lang": target_lang.value,
-                "tone": tone.value if isinstance(tone, Tone) else tone,
-                "error": str(e)
-            }
+        min_samples = settings.TRANSLATION_PIVOT_MIN_SAMPLES
+        first_leg = self.latency.mean(("provider", source_lang.value, pivot.value), min_samples)
+        if first_leg is None:
+            return set()
+        # La traduction vers le pivot est payée une fois pour toutes les cibles
+        # (gratuite si le pivot fait lui-même partie des cibles)
+        first_leg_share = 0.0 if pivot in targets else first_leg / len(candidates)
+
+        selected = set()
+        for target in candidates:
+            direct = self.latency.mean(("provider", source_lang.value, target.value), min_samples)
+            second_leg = self.latency.mean(("provider", pivot.value, target.value), min_samples)
+            if direct is None or second_leg is None:
+                continue
+            if first_leg_share + second_leg < direct:
+                selected.add(target)
+        return selected
+
+    async def translate_many(
+        self,
+        text: str,
+        source_lang: Union[str, Language],
+        target_langs: Iterable[Union[str, Language]],
+        tone: Union[str, Tone] = Tone.STANDARD,
+        max_length: int = 200,
+        on_segment: Optional[SegmentCallback] = None,
+        hints: Optional[Dict[str, str]] = None,
+        detect_source: bool = True
+    ) -> Dict[str, Dict]:
+        """
+        Traduit un texte vers plusieurs langues (fan-out de groupe).
+        En mode pivot, le texte est traduit une fois vers la langue pivot
+        (mis en cache et dédupliqué) puis réutilisé pour les cibles où
+        c'est plus rapide que la paire directe.
+        hints : traductions de phrases connues de l'appelant (voir edit_hints).
+        detect_source : False quand la langue source a déjà été identifiée (à l'envoi).
+        Retourne {code_langue: résultat de translate()}.
+        """
+        source_lang = Language(source_lang)
+        tone = Tone(tone)
+        targets = list(dict.fromkeys(Language(t) for t in target_langs))
+
+        if not has_translatable_content(text):
+            results = {}
+            for target in targets:
+                results[target.value] = self._result(text, source_lang, target, tone, confidence=1.0)
+                results[target.value]["skipped"] = "non_translatable"
+            return results
+
+        if detect_source:
+            source_lang = self._detect_source(text, source_lang)
+        via_pivot = self._pivot_targets(source_lang, targets)
+
+        async def run(target: Language) -> Dict:
+            if target == source_lang:
+                return self._result(text, source_lang, target, tone, confidence=1.0)
+
+            route = "pivot" if target in via_pivot else "direct"
+            start = time.perf_counter()
+            try:
+                if route == "pivot":
+                    pivot_text = await self._translate_text(
+                        text, source_lang, self.pivot_lang, tone, max_length
+                    )
+                    # La tonalité a déjà été appliquée sur la première étape
+                    translated = await self._translate_text(
+                        pivot_text, self.pivot_lang, target, Tone.STANDARD, max_length, on_segment
+                    )
+                else:
+                    translated = await self._translate_text(
+                        text, source_lang, target, tone, max_length, on_segment, hints
+                    )
+            except Exception as e:
+                return self._error(text, source_lang, target, tone, e)
+
+            self.latency.record((route, source_lang.value, target.value), time.perf_counter() - start)
+            result = self._result(translated, source_lang, target, tone)
+            result["route"] = route
+            return result
+
+        with deadline(settings.TRANSLATION_DEADLINE):
+            results = await asyncio.gather(*[run(target) for target in targets])
+        return {target.value: result for target, result in zip(targets, results)}
+
+    def get_pivot_stats(self) -> Dict[str, Dict]:
+        """Temps pivot vs direct par paire de langues ("fr->de": {...})"""
+        pairs: Dict[str, Dict] = {}
+        for key, stats in self.latency.items():
+            route, source, target = key
+            if route not in ("direct", "pivot"):
+                continue
+            pairs.setdefault(f"{source}->{target}", {})[route] = stats.summary()
+        return pairs
+
+    def get_stats(self) -> Dict:
+        """Compteurs du cache, du batching, de la déduplication, du disjoncteur et du pivot"""
+        return {
+            "provider": self.provider.name,
+            "routing": self.provider.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "batching": self.batcher.stats(),
+            "inflight": self.inflight.stats(),
+            "breaker": self.breaker.stats(),
+            "hedging": self.hedge_stats.stats(),
+            "pivot": self.get_pivot_stats()
+        }
 
     def get_supported_languages(self) -> List[str]:
         """Retourne la liste des codes de langue supportés."""
         return [lang.value for lang in Language]
 
     async def close(self):
-        """Libère les ressources (rien à faire car pas de modèle local)"""
-        pass
+        """Libère les ressources (backend et cache disque)"""
+        await self.batcher.close()
+        await self.provider.close()
+        if self.cache is not None:
+            self.cache.close()
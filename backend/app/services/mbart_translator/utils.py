@@ -0,0 +1,14 @@
+import re
+import unicodedata
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise un texte pour l'utiliser comme clé de cache.
+    NFC + espaces compactés : "ok ", "ok" et "ok\\n" partagent la même entrée.
+    La casse est conservée car elle peut changer la traduction.
+    """
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
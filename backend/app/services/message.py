@@ -1,14 +1,29 @@
-from typing import List, Optional
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, and_, or_, desc, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload, aliased
 from fastapi import HTTPException, status
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
 
-from app.models.message import Message, Conversation, ConversationParticipant, MessageStatusEnum
-from app.models.user import User
+from app.models.message import (
+    Message,
+    MessageTranslation,
+    Conversation,
+    ConversationParticipant,
+    MessageStatusEnum,
+    TranslationStatusEnum
+)
+from app.models.user import User, LanguageEnum
 from app.schemas.message import MessageCreate, ConversationCreate
+from app.services.mbart_translator.langid import detect_language, has_translatable_content
+from app.services.mbart_translator.resilience import deadline_at
+from app.services.translation_scheduler import Priority, SchedulerOverloaded, translation_scheduler
+from app.websocket.manager import manager
+from app.core.config import settings
 
 
 class MessageService:
@@ -83,35 +98,90 @@ class MessageService:
         message_create: MessageCreate,
         sender_id: UUID
     ) -> Message:
-        """Send a message"""
-        # Find or create conversation
-        conversation = await MessageService.get_conversation_between_users(
-            db, sender_id, message_create.receiver_id
-        )
-        
-        if not conversation:
-            # Create new conversation
-            conversation_data = ConversationCreate(
-                is_group=False,
-                participant_ids=[message_create.receiver_id]
-            )
-            conversation = await MessageService.create_conversation(
-                db, conversation_data, sender_id
+        """Send a message (1-on-1 or to a group conversation)"""
+        if message_create.conversation_id:
+            # Group (or explicit) conversation: sender must be a participant
+            conversation = await db.get(Conversation, message_create.conversation_id)
+            if not conversation:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Conversation not found"
+                )
+        else:
+            # Find or create conversation
+            conversation = await MessageService.get_conversation_between_users(
+                db, sender_id, message_create.receiver_id
             )
+            
+            if not conversation:
+                # Create new conversation
+                conversation_data = ConversationCreate(
+                    is_group=False,
+                    participant_ids=[message_create.receiver_id]
+                )
+                conversation = await MessageService.create_conversation(
+                    db, conversation_data, sender_id
+                )
         
         # Get sender to determine language
         sender = await db.get(User, sender_id)
         original_language = message_create.original_language or sender.preferred_language
         
+        # Fix the declared/fallback language with local identification
+        translatable = has_translatable_content(message_create.content)
+        if translatable and settings.TRANSLATION_LANGID_ENABLED:
+            detected, confidence = detect_language(
+                message_create.content,
+                settings.TRANSLATION_LANGID_MIN_LETTERS
+            )
+            if detected is not None and confidence >= settings.TRANSLATION_LANGID_MIN_CONFIDENCE:
+                original_language = LanguageEnum(detected.value)
+        
+        # Recipients: every participant except the sender
+        stmt = (
+            select(ConversationParticipant)
+            .where(ConversationParticipant.conversation_id == conversation.id)
+            .options(selectinload(ConversationParticipant.user))
+        )
+        result = await db.execute(stmt)
+        participants = result.scalars().all()
+        
+        if not any(p.user_id == sender_id for p in participants):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not a participant of this conversation"
+            )
+        recipients = [p for p in participants if p.user_id != sender_id]
+        receiver_id = (
+            recipients[0].user_id
+            if not conversation.is_group and len(recipients) == 1
+            else None
+        )
+        
+        # Translation is done in the background when any recipient language differs
+        # (emoji/URL/number/code-only messages have nothing to translate)
+        needs_translation = translatable and any(
+            p.user.preferred_language != original_language for p in recipients
+        )
+        
+        # Lazy mode: nobody online to read it yet, translate on first read
+        if (
+            needs_translation
+            and settings.TRANSLATION_LAZY
+            and not any(manager.is_user_reachable(p.user_id) for p in recipients)
+        ):
+            needs_translation = False
+        
         # Create message
         message = Message(
             content=message_create.content,
             original_language=original_language,
             tone=message_create.tone,
             sender_id=sender_id,
-            receiver_id=message_create.receiver_id,
+            receiver_id=receiver_id,
             conversation_id=conversation.id,
-            status=MessageStatusEnum.SENT
+            status=MessageStatusEnum.SENT,
+            translation_status=TranslationStatusEnum.PENDING if needs_translation else None
         )
         
         db.add(message)
@@ -119,22 +189,248 @@ class MessageService:
         # Update conversation timestamp
         conversation.updated_at = datetime.utcnow()
         
-        # Increment unread count for receiver
-        stmt = select(ConversationParticipant).where(
+        # Increment unread count for recipients
+        for participant in recipients:
+            participant.unread_count += 1
+        
+        await db.commit()
+        await db.refresh(message)
+        
+        return message
+    
+    @staticmethod
+    async def get_participant_languages(
+        db: AsyncSession,
+        conversation_id: UUID,
+        exclude_user: Optional[UUID] = None
+    ) -> Dict[LanguageEnum, List[UUID]]:
+        """Group conversation participants by preferred language"""
+        stmt = (
+            select(User.id, User.preferred_language)
+            .join(ConversationParticipant, ConversationParticipant.user_id == User.id)
+            .where(ConversationParticipant.conversation_id == conversation_id)
+        )
+        result = await db.execute(stmt)
+        
+        languages: Dict[LanguageEnum, List[UUID]] = {}
+        for user_id, language in result.all():
+            if exclude_user and user_id == exclude_user:
+                continue
+            languages.setdefault(language, []).append(user_id)
+        
+        return languages
+    
+    @staticmethod
+    async def get_participants_by_conversation(
+        db: AsyncSession,
+        conversation_ids: List[UUID]
+    ) -> Dict[UUID, Dict[UUID, LanguageEnum]]:
+        """Participants' preferred languages for several conversations in one query"""
+        if not conversation_ids:
+            return {}
+        
+        stmt = (
+            select(ConversationParticipant.conversation_id, User.id, User.preferred_language)
+            .join(User, ConversationParticipant.user_id == User.id)
+            .where(ConversationParticipant.conversation_id.in_(conversation_ids))
+        )
+        result = await db.execute(stmt)
+        
+        participants: Dict[UUID, Dict[UUID, LanguageEnum]] = {}
+        for conversation_id, user_id, language in result.all():
+            participants.setdefault(conversation_id, {})[user_id] = language
+        
+        return participants
+    
+    @staticmethod
+    async def get_conversation_rooms(
+        db: AsyncSession,
+        user_id: UUID
+    ) -> Dict[UUID, List[UUID]]:
+        """Participant ids of each conversation of a user (WebSocket rooms), ids only"""
+        member = aliased(ConversationParticipant)
+        stmt = (
+            select(ConversationParticipant.conversation_id, ConversationParticipant.user_id)
+            .join(member, member.conversation_id == ConversationParticipant.conversation_id)
+            .where(member.user_id == user_id)
+        )
+        result = await db.execute(stmt)
+        
+        rooms: Dict[UUID, List[UUID]] = {}
+        for conversation_id, participant_id in result.all():
+            rooms.setdefault(conversation_id, []).append(participant_id)
+        
+        return rooms
+    
+    @staticmethod
+    async def save_translations(
+        db: AsyncSession,
+        message_id: UUID,
+        translations: Dict[LanguageEnum, Optional[str]]
+    ) -> None:
+        """Upsert per-language translations (None = failed)"""
+        await MessageService.upsert_translations(db, [
+            (message_id, language, content)
+            for language, content in translations.items()
+        ])
+    
+    @staticmethod
+    async def upsert_translations(
+        db: AsyncSession,
+        translations: List[Tuple[UUID, LanguageEnum, Optional[str]]]
+    ) -> None:
+        """Upsert (message_id, language, content) rows in one statement"""
+        if not translations:
+            return
+        
+        rows = [
+            {
+                "id": uuid4(),
+                "message_id": message_id,
+                "language": language,
+                "translated_content": content,
+                "status": (
+                    TranslationStatusEnum.TRANSLATED if content is not None
+                    else TranslationStatusEnum.FAILED
+                ),
+            }
+            for message_id, language, content in translations
+        ]
+        stmt = pg_insert(MessageTranslation).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MessageTranslation.message_id, MessageTranslation.language],
+            set_={
+                "translated_content": stmt.excluded.translated_content,
+                "status": stmt.excluded.status,
+                "updated_at": func.now(),
+            }
+        )
+        await db.execute(stmt)
+    
+    @staticmethod
+    async def lock_unchanged(
+        db: AsyncSession,
+        contents: Dict[UUID, str],
+        translation_status: Optional[TranslationStatusEnum] = None
+    ) -> Set[UUID]:
+        """
+        Lock the messages whose content is still the translated one (and whose
+        status matches, if given) and return their ids: a translation of an
+        edited message must not be written.
+        """
+        if not contents:
+            return set()
+        
+        stmt = (
+            select(Message.id, Message.content)
+            .where(Message.id.in_(list(contents)))
+            .with_for_update()
+        )
+        if translation_status is not None:
+            stmt = stmt.where(Message.translation_status == translation_status)
+        result = await db.execute(stmt)
+        
+        return {message_id for message_id, content in result.all() if contents[message_id] == content}
+    
+    @staticmethod
+    async def get_translations(
+        db: AsyncSession,
+        message_ids: List[UUID],
+        language: LanguageEnum
+    ) -> Dict[UUID, MessageTranslation]:
+        """Get stored translations of messages into one language"""
+        if not message_ids:
+            return {}
+        
+        stmt = select(MessageTranslation).where(
             and_(
-                ConversationParticipant.conversation_id == conversation.id,
-                ConversationParticipant.user_id == message_create.receiver_id
+                MessageTranslation.message_id.in_(message_ids),
+                MessageTranslation.language == language,
+                MessageTranslation.status == TranslationStatusEnum.TRANSLATED
             )
         )
         result = await db.execute(stmt)
-        participant = result.scalar_one_or_none()
-        if participant:
-            participant.unread_count += 1
+        return {t.message_id: t for t in result.scalars().all()}
+    
+    @staticmethod
+    async def translate_on_read(
+        db: AsyncSession,
+        messages: List[Message],
+        translations: Dict[UUID, MessageTranslation],
+        language: LanguageEnum,
+        user_id: UUID
+    ) -> Dict[UUID, MessageTranslation]:
+        """
+        Lazy mode: translate the messages of a page that have no stored
+        translation in the reader's language, in one batch, and persist them.
+        Returns the new translations (failures, and messages not translated
+        within TRANSLATION_READ_DEADLINE, are left for a later read).
+        """
+        if not settings.TRANSLATION_LAZY:
+            return {}
+        
+        missing = [
+            m for m in messages
+            if m.id not in translations
+            and m.sender_id != user_id
+            and m.original_language != language
+            and m.translation_status != TranslationStatusEnum.TRANSLATING
+            # 1-on-1 messages already translated in the legacy columns
+            and not (m.translated_content and m.target_language == language)
+            and has_translatable_content(m.content)
+        ]
+        if not missing:
+            return {}
+        
+        # Lazy import: the translator is only loaded when needed
+        from app.services.mbart_translator.translation import MBartTranslator
+        translator = await MBartTranslator.get_instance()
+        
+        # Concurrent calls share the translator's cache and micro-batches;
+        # time spent queued counts against the reader's budget
+        expires_at = time.monotonic() + settings.TRANSLATION_READ_DEADLINE
+        
+        async def translate_page():
+            with deadline_at(expires_at):
+                return await asyncio.gather(*[
+                    translator.translate(
+                        m.content,
+                        m.original_language.value,
+                        language.value,
+                        m.tone.value,
+                        detect_source=False
+                    )
+                    for m in missing
+                ])
+        
+        # The page is served untranslated rather than late; a job already
+        # running still completes and fills the cache for the next read
+        try:
+            results = await asyncio.wait_for(
+                translation_scheduler.run(translate_page, Priority.INTERACTIVE, user_id),
+                max(0.0, expires_at - time.monotonic())
+            )
+        except (SchedulerOverloaded, asyncio.TimeoutError):
+            return {}
         
+        translated = {
+            m.id: MessageTranslation(
+                message_id=m.id,
+                language=language,
+                translated_content=result["translated_text"],
+                status=TranslationStatusEnum.TRANSLATED
+            )
+            for m, result in zip(missing, results)
+            if result["success"]
+        }
+        
+        await MessageService.upsert_translations(db, [
+            (message_id, language, t.translated_content)
+            for message_id, t in translated.items()
+        ])
         await db.commit()
-        await db.refresh(message)
         
-        return message
+        return translated
     
     @staticmethod
     async def get_conversation_messages(
@@ -211,7 +507,22 @@ class MessageService:
                 detail="Message not found"
             )
         
-        if message.receiver_id != user_id:
+        stmt = select(ConversationParticipant).where(
+            and_(
+                ConversationParticipant.conversation_id == message.conversation_id,
+                ConversationParticipant.user_id == user_id
+            )
+        )
+        result = await db.execute(stmt)
+        participant = result.scalar_one_or_none()
+        
+        # 1-on-1: only the receiver; group: any other participant
+        if message.receiver_id is not None:
+            authorized = message.receiver_id == user_id
+        else:
+            authorized = participant is not None and message.sender_id != user_id
+        
+        if not authorized:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to mark this message as read"
@@ -221,14 +532,6 @@ class MessageService:
         message.read_at = datetime.utcnow()
         
         # Decrement unread count
-        stmt = select(ConversationParticipant).where(
-            and_(
-                ConversationParticipant.conversation_id == message.conversation_id,
-                ConversationParticipant.user_id == user_id
-            )
-        )
-        result = await db.execute(stmt)
-        participant = result.scalar_one_or_none()
         if participant and participant.unread_count > 0:
             participant.unread_count -= 1
             participant.last_read_at = datetime.utcnow()
@@ -238,6 +541,73 @@ class MessageService:
         
         return message
     
+    @staticmethod
+    async def edit_message(
+        db: AsyncSession,
+        message_id: UUID,
+        user_id: UUID,
+        content: str
+    ) -> Tuple[Message, str, Dict[LanguageEnum, str]]:
+        """
+        Edit a message's content.
+        Returns (message, previous content, previous translations by language);
+        the message is left PENDING when its translations must be updated.
+        """
+        message = await db.get(Message, message_id)
+        
+        if not message:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Message not found"
+            )
+        
+        if message.sender_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to edit this message"
+            )
+        
+        previous_content = message.content
+        
+        stmt = select(MessageTranslation).where(
+            and_(
+                MessageTranslation.message_id == message_id,
+                MessageTranslation.status == TranslationStatusEnum.TRANSLATED
+            )
+        )
+        result = await db.execute(stmt)
+        previous_translations = {
+            t.language: t.translated_content for t in result.scalars().all()
+        }
+        if message.translated_content and message.target_language:
+            previous_translations.setdefault(message.target_language, message.translated_content)
+        
+        message.content = content
+        if content != previous_content:
+            # Stored translations belong to the previous content
+            await db.execute(
+                delete(MessageTranslation).where(MessageTranslation.message_id == message_id)
+            )
+            message.translated_content = None
+            message.target_language = None
+            message.translation_attempts = 0
+            message.translation_retry_at = None
+            
+            languages = await MessageService.get_participant_languages(
+                db, message.conversation_id, exclude_user=user_id
+            )
+            needs_translation = has_translatable_content(content) and any(
+                language != message.original_language for language in languages
+            )
+            message.translation_status = (
+                TranslationStatusEnum.PENDING if needs_translation else None
+            )
+        
+        await db.commit()
+        await db.refresh(message)
+        
+        return message, previous_content, previous_translations
+    
     @staticmethod
     async def delete_message(
         db: AsyncSession,
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Dict, List, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+
+from app.models.user import LanguageEnum, MessageToneEnum
+from app.schemas.message import (
+    TranslationRequest,
+    TranslationResponse,
+    BatchTranslationRequest,
+    BatchTranslationItem,
+    BatchTranslationResponse
+)
+from app.services.translation_scheduler import Priority, SchedulerOverloaded, translation_scheduler
+
+ItemKey = Tuple[str, LanguageEnum, LanguageEnum, MessageToneEnum]
+
+
+class TranslationService:
+    """On-demand translation (explicit API calls, batch priority)"""
+    
+    @staticmethod
+    async def _translate_items(
+        items: List[TranslationRequest],
+        user_id: UUID
+    ) -> List[Dict]:
+        """
+        Translate items as one scheduler job: identical items are translated once,
+        the others share the translator's cache and micro-batches.
+        """
+        # Lazy import: the translator is only loaded when needed
+        from app.services.mbart_translator.translation import MBartTranslator
+        translator = await MBartTranslator.get_instance()
+        
+        unique: Dict[ItemKey, int] = {}
+        for item in items:
+            key = (item.text, item.source_language, item.target_language, item.tone)
+            unique.setdefault(key, len(unique))
+        
+        async def translate_all():
+            return await asyncio.gather(*[
+                translator.translate(text, source.value, target.value, tone.value)
+                for text, source, target, tone in unique
+            ])
+        
+        try:
+            results = await translation_scheduler.run(translate_all, Priority.BATCH, user_id)
+        except SchedulerOverloaded:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Translation service overloaded, retry later",
+                headers={"Retry-After": "5"}
+            )
+        
+        return [
+            results[unique[(item.text, item.source_language, item.target_language, item.tone)]]
+            for item in items
+        ]
+    
+    @staticmethod
+    async def translate_request(
+        translation_request: TranslationRequest,
+        user_id: UUID
+    ) -> TranslationResponse:
+        """Translate one text"""
+        [result] = await TranslationService._translate_items([translation_request], user_id)
+        
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Translation failed: {result['error']}"
+            )
+        
+        return TranslationResponse(
+            translated_text=result["translated_text"],
+            source_language=LanguageEnum(result["source_lang"]),
+            target_language=LanguageEnum(result["target_lang"]),
+            confidence=result.get("confidence")
+        )
+    
+    @staticmethod
+    async def translate_batch(
+        batch_request: BatchTranslationRequest,
+        user_id: UUID
+    ) -> BatchTranslationResponse:
+        """Translate a list of texts, with a status per item"""
+        results = await TranslationService._translate_items(batch_request.items, user_id)
+        
+        items = []
+        for result in results:
+            if not result["success"]:
+                item_status = "failed"
+            elif result.get("skipped") or result["source_lang"] == result["target_lang"]:
+                item_status = "skipped"
+            else:
+                item_status = "translated"
+            
+            items.append(BatchTranslationItem(
+                translated_text=result["translated_text"],
+                source_language=LanguageEnum(result["source_lang"]),
+                target_language=LanguageEnum(result["target_lang"]),
+                confidence=result.get("confidence"),
+                status=item_status,
+                error=result.get("error")
+            ))
+        
+        return BatchTranslationResponse(
+            results=items,
+            translated=sum(1 for item in items if item.status == "translated"),
+            failed=sum(1 for item in items if item.status == "failed")
+        )
+
+
+translation_service = TranslationService()
@@ -0,0 +1,251 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update, tuple_, func, or_
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.message import Message, TranslationStatusEnum
+from app.models.user import LanguageEnum
+from app.services.message import message_service
+from app.services.translation_pipeline import translation_pipeline
+from app.services.translation_scheduler import Priority, SchedulerOverloaded, translation_scheduler
+
+Cursor = Tuple[datetime, UUID]
+
+
+class TranslationBackfill:
+    """
+    Background retry of FAILED and PENDING translations, and of TRANSLATING ones
+    left behind by a job that died (shutdown, DB error).
+
+    Periodically scans those messages in keyset-paginated batches (created_at, id),
+    translates each batch as one background-priority scheduler job, writes the
+    results with bulk statements and pushes `message_translated` to connected
+    participants. Failed messages are retried with exponential backoff; attempts
+    and the next retry time are stored on the message, so exhausted or not yet
+    due messages are filtered by the scan itself, across restarts and workers.
+    Concurrency and throughput are capped so a backfill never competes with
+    live traffic.
+    """
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.translated = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        """Start the periodic backfill loop"""
+        if settings.TRANSLATION_BACKFILL_ENABLED:
+            self.task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.TRANSLATION_BACKFILL_INTERVAL)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Translation backfill error: {str(e)}")
+
+    @staticmethod
+    def _retry_at(attempts: int) -> datetime:
+        """Next retry of a message that failed `attempts` times"""
+        delay = min(
+            settings.TRANSLATION_BACKFILL_BASE_DELAY * 2 ** (attempts - 1),
+            settings.TRANSLATION_BACKFILL_MAX_DELAY
+        )
+        return datetime.utcnow() + timedelta(seconds=delay)
+
+    async def run_once(self) -> int:
+        """One pass over all FAILED/PENDING/stale TRANSLATING messages; returns the number retried"""
+        now = datetime.utcnow()
+        retryable = [
+            Message.translation_status.in_([
+                TranslationStatusEnum.FAILED,
+                TranslationStatusEnum.PENDING,
+                TranslationStatusEnum.TRANSLATING
+            ]),
+            # Messages changed more recently are still owned by the live pipeline (keep
+            # TRANSLATION_BACKFILL_MIN_AGE above TRANSLATION_QUEUE_MAX_WAIT + TRANSLATION_DEADLINE)
+            func.coalesce(Message.updated_at, Message.created_at)
+            < now - timedelta(seconds=settings.TRANSLATION_BACKFILL_MIN_AGE),
+            # Exhausted and backing-off messages are left out of the scan
+            Message.translation_attempts < settings.TRANSLATION_BACKFILL_MAX_ATTEMPTS,
+            or_(Message.translation_retry_at.is_(None), Message.translation_retry_at <= now)
+        ]
+        cursor: Optional[Cursor] = None
+        retried = 0
+
+        while True:
+            started = time.monotonic()
+            async with AsyncSessionLocal() as db:
+                stmt = (
+                    select(Message)
+                    .where(*retryable)
+                    .order_by(Message.created_at, Message.id)
+                    .limit(settings.TRANSLATION_BACKFILL_BATCH_SIZE)
+                )
+                if cursor is not None:
+                    stmt = stmt.where(tuple_(Message.created_at, Message.id) > cursor)
+                page = list((await db.execute(stmt)).scalars().all())
+                if not page:
+                    return retried
+                cursor = (page[-1].created_at, page[-1].id)
+
+                # Claim the page (the live pipeline only picks up PENDING); messages
+                # edited or claimed by another worker since the scan are skipped
+                claimed = set((await db.execute(
+                    update(Message)
+                    .where(Message.id.in_([m.id for m in page]), *retryable)
+                    .values(translation_status=TranslationStatusEnum.TRANSLATING)
+                    .returning(Message.id)
+                )).scalars().all())
+                batch = [m for m in page if m.id in claimed]
+                participants = {}
+                if batch:
+                    participants = await message_service.get_participants_by_conversation(
+                        db, list({m.conversation_id for m in batch})
+                    )
+                # Release the pooled connection while the provider works
+                await db.commit()
+
+            if batch:
+                try:
+                    await self._process_batch(batch, participants)
+                except SchedulerOverloaded:
+                    # Live traffic first: resume on the next pass
+                    return retried
+                retried += len(batch)
+
+            # Throughput cap (messages per second)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, len(batch) / settings.TRANSLATION_BACKFILL_RATE - elapsed))
+
+    async def _process_batch(
+        self,
+        messages: List[Message],
+        participants: Dict[UUID, Dict[UUID, LanguageEnum]]
+    ) -> None:
+        # Lazy import: the translator is only loaded when needed
+        from app.services.mbart_translator.translation import MBartTranslator
+
+        # Recipient languages of each message (sender excluded)
+        languages: Dict[UUID, Dict[LanguageEnum, List[UUID]]] = {}
+        for m in messages:
+            by_language: Dict[LanguageEnum, List[UUID]] = {}
+            for user_id, language in participants.get(m.conversation_id, {}).items():
+                if user_id != m.sender_id:
+                    by_language.setdefault(language, []).append(user_id)
+            languages[m.id] = by_language
+
+        translator = await MBartTranslator.get_instance()
+        semaphore = asyncio.Semaphore(settings.TRANSLATION_BACKFILL_CONCURRENCY)
+
+        async def translate(m: Message) -> Dict[LanguageEnum, Optional[str]]:
+            targets = [lang for lang in languages[m.id] if lang != m.original_language]
+            if not targets:
+                return {}
+            async with semaphore:
+                results = await translator.translate_many(
+                    m.content,
+                    m.original_language.value,
+                    [target.value for target in targets],
+                    m.tone.value,
+                    detect_source=False
+                )
+            return {
+                target: (
+                    results[target.value]["translated_text"]
+                    if results[target.value]["success"] else None
+                )
+                for target in targets
+            }
+
+        # Concurrent messages share the translator's micro-batches
+        async def translate_all():
+            return await asyncio.gather(*[translate(m) for m in messages])
+
+        results = await translation_scheduler.run(translate_all, Priority.BACKGROUND, "backfill")
+
+        async with AsyncSessionLocal() as db:
+            # Messages edited meanwhile are left to the edit's own job
+            unchanged = await message_service.lock_unchanged(
+                db, {m.id: m.content for m in messages}, TranslationStatusEnum.TRANSLATING
+            )
+            done = [(m, translations) for m, translations in zip(messages, results) if m.id in unchanged]
+            await self._write(db, done)
+
+        # Only successes are pushed: participants already saw the failure;
+        # readers of the original get the closing event a shed job never sent
+        for m, translations in done:
+            translated = {lang: text for lang, text in translations.items() if text is not None}
+            await translation_pipeline.notify_translated(
+                m.id, m.conversation_id, languages[m.id], translated
+            )
+            await translation_pipeline.notify_untranslated(
+                m.id,
+                m.conversation_id,
+                translation_pipeline.untranslated_participants(m, languages[m.id])
+            )
+
+    async def _write(
+        self,
+        db,
+        done: List[Tuple[Message, Dict[LanguageEnum, Optional[str]]]]
+    ) -> None:
+        rows = []
+        updates = []
+        for m, translations in done:
+            rows.extend((m.id, language, text) for language, text in translations.items())
+
+            if not translations:
+                # Nobody needs a translation anymore
+                status = None
+            elif all(text is not None for text in translations.values()):
+                status = TranslationStatusEnum.TRANSLATED
+            else:
+                status = TranslationStatusEnum.FAILED
+
+            values = {
+                "id": m.id,
+                "translation_status": status,
+                "translation_attempts": 0,
+                "translation_retry_at": None,
+            }
+            # 1-on-1 messages keep the legacy single-language columns filled
+            if m.receiver_id is not None and len(translations) == 1:
+                [(language, text)] = translations.items()
+                values["translated_content"] = text
+                values["target_language"] = language
+            updates.append(values)
+
+            if status == TranslationStatusEnum.FAILED:
+                self.failed += 1
+                values["translation_attempts"] = m.translation_attempts + 1
+                values["translation_retry_at"] = self._retry_at(m.translation_attempts + 1)
+            else:
+                self.translated += 1
+
+        await message_service.upsert_translations(db, rows)
+        # Bulk UPDATE by primary key
+        if updates:
+            await db.execute(update(Message), updates)
+        await db.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "translated": self.translated,
+            "failed": self.failed,
+        }
+
+
+translation_backfill = TranslationBackfill()
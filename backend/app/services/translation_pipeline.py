@@ -0,0 +1,329 @@
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import update
+
+from app.db.session import AsyncSessionLocal
+from app.models.message import Message, TranslationStatusEnum
+from app.models.user import LanguageEnum
+from app.services.message import message_service
+from app.services.mbart_translator.segmentation import diff_segments
+from app.services.translation_scheduler import Priority, translation_scheduler
+from app.websocket.manager import manager
+
+
+class TranslationPipeline:
+    """
+    Background translation of sent messages.
+
+    Messages are committed as PENDING and broadcast immediately; the
+    translation scheduler runs them afterwards (once per distinct participant
+    language) and pushes a `message_translated` event, so send latency no
+    longer depends on the translation provider. Long messages also stream
+    `translation_progress` events, one per translated sentence. Participants
+    who need no translation (the sender, readers of the original language)
+    receive a closing event without translation, so no one is left "pending".
+    """
+
+    def enqueue(
+        self,
+        message_id: UUID,
+        sender_id: UUID,
+        recipient_ids: Iterable[UUID] = ()
+    ) -> bool:
+        """
+        Queue a message for translation: interactive priority if a recipient
+        is online, background otherwise. Jobs are shared fairly across senders.
+        Returns False if the job was shed; the message then stays PENDING.
+        """
+        return translation_scheduler.submit(
+            lambda: self.process(message_id),
+            self._priority(recipient_ids),
+            sender_id
+        )
+
+    def enqueue_edit(
+        self,
+        message_id: UUID,
+        sender_id: UUID,
+        recipient_ids: Iterable[UUID],
+        previous_content: str,
+        previous_translations: Dict[LanguageEnum, str]
+    ) -> bool:
+        """Queue the retranslation of an edited message (same priority rules)"""
+        return translation_scheduler.submit(
+            lambda: self.process_edit(message_id, previous_content, previous_translations),
+            self._priority(recipient_ids),
+            sender_id
+        )
+
+    @staticmethod
+    def _priority(recipient_ids: Iterable[UUID]) -> Priority:
+        return (
+            Priority.INTERACTIVE
+            if any(manager.is_user_reachable(user_id) for user_id in recipient_ids)
+            else Priority.BACKGROUND
+        )
+
+    async def process(self, message_id: UUID) -> None:
+        """
+        Translate one message once per distinct recipient language and
+        notify each participant in their own language.
+        """
+        # Lazy import: the translator is only loaded when needed
+        from app.services.mbart_translator.translation import MBartTranslator
+
+        async with AsyncSessionLocal() as db:
+            message = await db.get(Message, message_id)
+            if not message or message.translation_status != TranslationStatusEnum.PENDING:
+                return
+
+            languages = await message_service.get_participant_languages(
+                db, message.conversation_id, exclude_user=message.sender_id
+            )
+            targets = [lang for lang in languages if lang != message.original_language]
+            untranslated = self.untranslated_participants(message, languages)
+            if not targets:
+                message.translation_status = None
+                await db.commit()
+                await self.notify_untranslated(message_id, message.conversation_id, untranslated)
+                return
+
+            content = message.content
+            message.translation_status = TranslationStatusEnum.TRANSLATING
+            # Commit releases the pooled connection while the provider works
+            await db.commit()
+
+            # Long messages: stream each translated sentence as it completes
+            async def on_segment(target_language: str, index: int, total: int, text: str):
+                event = {
+                    "id": str(message_id),
+                    "conversation_id": str(message.conversation_id),
+                    "target_language": target_language,
+                    "index": index,
+                    "total": total,
+                    "text": text,
+                }
+                for user_id in languages.get(LanguageEnum(target_language), []):
+                    await manager.send_translation_progress(event, user_id)
+
+            translator = await MBartTranslator.get_instance()
+            results = await translator.translate_many(
+                message.content,
+                message.original_language.value,
+                [target.value for target in targets],
+                message.tone.value,
+                on_segment=on_segment,
+                # Source language already identified when the message was sent
+                detect_source=False
+            )
+            translations = {
+                target: (
+                    results[target.value]["translated_text"]
+                    if results[target.value]["success"] else None
+                )
+                for target in targets
+            }
+
+            if not await self._store(db, message, content, translations):
+                return
+
+        await self.notify_translated(message_id, message.conversation_id, languages, translations)
+        await self.notify_untranslated(message_id, message.conversation_id, untranslated)
+
+    async def process_edit(
+        self,
+        message_id: UUID,
+        previous_content: str,
+        previous_translations: Dict[LanguageEnum, str]
+    ) -> None:
+        """
+        Retranslate an edited message. Sentences that did not change are served
+        from the cache (seeded from the previous translations), so only edited
+        sentences reach the provider. Each participant receives a
+        `message_edited` delta of the translation in their language.
+        """
+        # Lazy import: the translator is only loaded when needed
+        from app.services.mbart_translator.translation import MBartTranslator
+
+        async with AsyncSessionLocal() as db:
+            message = await db.get(Message, message_id)
+            if not message or message.translation_status != TranslationStatusEnum.PENDING:
+                return
+
+            languages = await message_service.get_participant_languages(
+                db, message.conversation_id, exclude_user=message.sender_id
+            )
+            targets = [lang for lang in languages if lang != message.original_language]
+            untranslated = self.untranslated_participants(message, languages)
+            if not targets:
+                message.translation_status = None
+                await db.commit()
+                await self.notify_untranslated(
+                    message_id, message.conversation_id, untranslated, manager.send_message_edited
+                )
+                return
+
+            content = message.content
+            message.translation_status = TranslationStatusEnum.TRANSLATING
+            await db.commit()
+
+            # Unchanged sentences reuse the previous translations (this edit only)
+            translator = await MBartTranslator.get_instance()
+            hints: Dict[str, str] = {}
+            for target in targets:
+                if target in previous_translations:
+                    hints.update(translator.edit_hints(
+                        previous_content,
+                        previous_translations[target],
+                        message.original_language.value,
+                        target.value,
+                        message.tone.value
+                    ))
+
+            results = await translator.translate_many(
+                content,
+                message.original_language.value,
+                [target.value for target in targets],
+                message.tone.value,
+                hints=hints
+            )
+            translations = {
+                target: (
+                    results[target.value]["translated_text"]
+                    if results[target.value]["success"] else None
+                )
+                for target in targets
+            }
+
+            if not await self._store(db, message, content, translations):
+                return
+
+        # Compact delta against the translation each participant already has
+        for language, user_ids in languages.items():
+            if language not in translations:
+                continue
+            text = translations[language]
+            event = {
+                "id": str(message_id),
+                "conversation_id": str(message.conversation_id),
+                "target_language": language.value,
+                "translation_status": (
+                    TranslationStatusEnum.TRANSLATED if text is not None
+                    else TranslationStatusEnum.FAILED
+                ).value,
+            }
+            previous = previous_translations.get(language)
+            if text is not None and previous is not None:
+                event["translated_ops"] = diff_segments(previous, text)
+            else:
+                event["translated_content"] = text
+            for user_id in user_ids:
+                if manager.is_user_reachable(user_id):
+                    await manager.send_message_edited(event, user_id)
+        await self.notify_untranslated(
+            message_id, message.conversation_id, untranslated, manager.send_message_edited
+        )
+
+    @staticmethod
+    def untranslated_participants(
+        message: Message,
+        languages: Dict[LanguageEnum, List[UUID]]
+    ) -> List[UUID]:
+        """Participants reading the original: the sender and recipients of its language"""
+        return [message.sender_id] + languages.get(message.original_language, [])
+
+    @staticmethod
+    async def _store(
+        db,
+        message: Message,
+        content: str,
+        translations: Dict[LanguageEnum, Optional[str]]
+    ) -> bool:
+        """
+        Save the translations of `content` and close the TRANSLATING status.
+        Returns False (nothing written) when the message was edited meanwhile:
+        the edit's own job translates the new content.
+        """
+        all_translated = all(text is not None for text in translations.values())
+        values = {
+            "translation_status": (
+                TranslationStatusEnum.TRANSLATED if all_translated
+                else TranslationStatusEnum.FAILED
+            ),
+        }
+        # 1-on-1 messages keep the legacy single-language columns filled
+        if message.receiver_id is not None and len(translations) == 1:
+            [(language, text)] = translations.items()
+            values["translated_content"] = text
+            values["target_language"] = language
+
+        result = await db.execute(
+            update(Message)
+            .where(
+                Message.id == message.id,
+                Message.content == content,
+                Message.translation_status == TranslationStatusEnum.TRANSLATING
+            )
+            .values(**values)
+        )
+        if result.rowcount == 0:
+            await db.rollback()
+            return False
+
+        await message_service.save_translations(db, message.id, translations)
+        await db.commit()
+        return True
+
+    @staticmethod
+    async def notify_translated(
+        message_id: UUID,
+        conversation_id: UUID,
+        languages: Dict[LanguageEnum, List[UUID]],
+        translations: Dict[LanguageEnum, Optional[str]]
+    ) -> None:
+        """Send each (connected) participant the translation in their own language"""
+        for language, user_ids in languages.items():
+            if language not in translations:
+                continue
+            text = translations[language]
+            event = {
+                "id": str(message_id),
+                "conversation_id": str(conversation_id),
+                "translated_content": text,
+                "target_language": language.value,
+                "translation_status": (
+                    TranslationStatusEnum.TRANSLATED if text is not None
+                    else TranslationStatusEnum.FAILED
+                ).value,
+            }
+            for user_id in user_ids:
+                if manager.is_user_reachable(user_id):
+                    await manager.send_message_translated(event, user_id)
+
+    @staticmethod
+    async def notify_untranslated(
+        message_id: UUID,
+        conversation_id: UUID,
+        user_ids: Iterable[UUID],
+        send=None
+    ) -> None:
+        """
+        Close the "pending" status broadcast with the message (or edit) for
+        participants who read the original; `send` is the manager method of
+        the event to close (message_translated by default, or message_edited)
+        """
+        send = send or manager.send_message_translated
+        event = {
+            "id": str(message_id),
+            "conversation_id": str(conversation_id),
+            "translated_content": None,
+            "target_language": None,
+            "translation_status": None,
+        }
+        for user_id in user_ids:
+            if manager.is_user_reachable(user_id):
+                await send(event, user_id)
+
+
+translation_pipeline = TranslationPipeline()
@@ -0,0 +1,227 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional
+
+from app.core.config import settings
+
+
+class Priority(IntEnum):
+    """Translation priority classes (lower value runs first)"""
+    INTERACTIVE = 0  # at least one recipient is online
+    BACKGROUND = 1  # offline recipients, backfills
+    BATCH = 2  # explicit translation API calls
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when a job is rejected or shed because its class is saturated"""
+
+
+@dataclass
+class _Job:
+    fn: Callable[[], Awaitable[Any]]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    future: Optional[asyncio.Future] = None
+
+
+class _PriorityClass:
+    """Bounded queue of one priority class, round-robin across users"""
+
+    def __init__(self, max_size: int, max_per_user: int):
+        self.max_size = max_size
+        self.max_per_user = max_per_user
+        self.queues: "OrderedDict[Hashable, Deque[_Job]]" = OrderedDict()
+        self.size = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.shed = 0
+        self.completed = 0
+
+    def push(self, user_key: Hashable, job: _Job) -> bool:
+        jobs = self.queues.get(user_key)
+        if self.size >= self.max_size or (jobs is not None and len(jobs) >= self.max_per_user):
+            self.rejected += 1
+            return False
+        if jobs is None:
+            jobs = self.queues[user_key] = deque()
+        jobs.append(job)
+        self.size += 1
+        self.submitted += 1
+        return True
+
+    def pop(self) -> Optional[_Job]:
+        if not self.queues:
+            return None
+        # Next user in turn; they go to the back of the line if they still have work
+        user_key, jobs = next(iter(self.queues.items()))
+        job = jobs.popleft()
+        if jobs:
+            self.queues.move_to_end(user_key)
+        else:
+            del self.queues[user_key]
+        self.size -= 1
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.size,
+            "users": len(self.queues),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "shed": self.shed,
+            "completed": self.completed,
+        }
+
+
+class TranslationScheduler:
+    """
+    Priority-aware admission control for translation work.
+
+    Jobs are queued per priority class (interactive > background > batch) and
+    served round-robin across users inside a class, so one busy sender cannot
+    starve the others. Some workers only serve interactive jobs, keeping live
+    conversations fast while long background jobs are running. Jobs wait on
+    I/O, so the pool is sized for concurrency (TRANSLATION_WORKERS jobs in
+    flight), which also gives the micro-batcher enough concurrent calls to fill
+    its batches.
+
+    Queues are bounded: when a class is full, or a job has waited longer than
+    TRANSLATION_QUEUE_MAX_WAIT, the job is shed instead of run late. Messages
+    then stay PENDING in database; API callers get `SchedulerOverloaded`.
+    """
+
+    def __init__(self):
+        self.classes: Dict[Priority, _PriorityClass] = {}
+        self.workers: List[asyncio.Task] = []
+        self._has_work = asyncio.Event()
+
+    async def start(self) -> None:
+        """Start the worker pool"""
+        self.classes = {
+            priority: _PriorityClass(
+                settings.TRANSLATION_QUEUE_SIZE,
+                settings.TRANSLATION_QUEUE_MAX_PER_USER
+            )
+            for priority in Priority
+        }
+        self._has_work = asyncio.Event()
+
+        total = max(1, settings.TRANSLATION_WORKERS)
+        reserved = min(max(0, settings.TRANSLATION_INTERACTIVE_WORKERS), total - 1)
+        self.workers = [
+            asyncio.create_task(self._worker((Priority.INTERACTIVE,)))
+            for _ in range(reserved)
+        ] + [
+            asyncio.create_task(self._worker(tuple(Priority)))
+            for _ in range(total - reserved)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the worker pool (queued jobs are dropped; messages stay PENDING)"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+        for queue in self.classes.values():
+            while (job := queue.pop()) is not None:
+                if job.future is not None and not job.future.done():
+                    job.future.set_exception(SchedulerOverloaded("Translation scheduler stopped"))
+
+    def submit(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        priority: Priority,
+        user_key: Hashable
+    ) -> bool:
+        """
+        Queue a fire-and-forget job.
+        Returns False if it was rejected (scheduler stopped or class full).
+        """
+        return self._push(_Job(fn), priority, user_key)
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        priority: Priority,
+        user_key: Hashable
+    ) -> Any:
+        """Queue a job and wait for its result (raises SchedulerOverloaded if shed)"""
+        job = _Job(fn, future=asyncio.get_running_loop().create_future())
+        if not self._push(job, priority, user_key):
+            raise SchedulerOverloaded(f"Translation queue full ({priority.name.lower()})")
+        return await job.future
+
+    def _push(self, job: _Job, priority: Priority, user_key: Hashable) -> bool:
+        if not self.workers:
+            return False
+        if not self.classes[priority].push(user_key, job):
+            return False
+        self._has_work.set()
+        return True
+
+    def _pop(self, priorities) -> Optional[tuple]:
+        for priority in priorities:
+            job = self.classes[priority].pop()
+            if job is not None:
+                return priority, job
+        return None
+
+    async def _worker(self, priorities) -> None:
+        while True:
+            picked = self._pop(priorities)
+            if picked is None:
+                self._has_work.clear()
+                await self._has_work.wait()
+                continue
+
+            priority, job = picked
+            queue = self.classes[priority]
+
+            if job.future is not None and job.future.done():
+                # Caller went away (request cancelled)
+                continue
+            if time.monotonic() - job.enqueued_at > settings.TRANSLATION_QUEUE_MAX_WAIT:
+                queue.shed += 1
+                if job.future is not None:
+                    job.future.set_exception(
+                        SchedulerOverloaded(f"Translation queue wait exceeded ({priority.name.lower()})")
+                    )
+                continue
+
+            try:
+                result = await job.fn()
+                if job.future is not None and not job.future.done():
+                    job.future.set_result(result)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    # The worker itself is stopping
+                    if job.future is not None and not job.future.done():
+                        job.future.cancel()
+                    raise
+                # A cancellation from inside the job only fails that job
+                if job.future is not None and not job.future.done():
+                    job.future.set_exception(RuntimeError("Translation job cancelled"))
+                else:
+                    print("Translation job error: cancelled")
+            except Exception as e:
+                if job.future is not None and not job.future.done():
+                    job.future.set_exception(e)
+                else:
+                    print(f"Translation job error: {str(e)}")
+            finally:
+                queue.completed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self.workers),
+            "classes": {
+                priority.name.lower(): queue.stats()
+                for priority, queue in self.classes.items()
+            },
+        }
+
+
+translation_scheduler = TranslationScheduler()
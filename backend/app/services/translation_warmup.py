@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, func
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.message import Message, MessageTranslation, TranslationStatusEnum
+
+# Longer messages are cached per sentence, their full translation is not a cache entry
+WARMUP_MAX_TEXT_LENGTH = 200
+
+WarmupKey = Tuple[str, str, str, str]
+
+
+async def _frequent_translations(since: datetime, limit: int) -> Dict[WarmupKey, Tuple[str, int]]:
+    """Most used (content, source, target, tone) -> (translation, uses) since a date"""
+    found: Dict[WarmupKey, Tuple[str, int]] = {}
+    
+    def merge(rows) -> None:
+        for content, source, target, tone, translated, uses in rows:
+            key = (content, source.value, target.value, tone.value)
+            if key not in found or found[key][1] < uses:
+                found[key] = (translated, uses)
+    
+    async with AsyncSessionLocal() as db:
+        # Per-language translations (group and 1-on-1 messages)
+        uses = func.count().label("uses")
+        stmt = (
+            select(
+                Message.content,
+                Message.original_language,
+                MessageTranslation.language,
+                Message.tone,
+                MessageTranslation.translated_content,
+                uses
+            )
+            .join(MessageTranslation, MessageTranslation.message_id == Message.id)
+            .where(
+                Message.created_at >= since,
+                MessageTranslation.status == TranslationStatusEnum.TRANSLATED,
+                MessageTranslation.translated_content.isnot(None),
+                func.length(Message.content) <= WARMUP_MAX_TEXT_LENGTH
+            )
+            .group_by(
+                Message.content,
+                Message.original_language,
+                MessageTranslation.language,
+                Message.tone,
+                MessageTranslation.translated_content
+            )
+            .order_by(uses.desc())
+            .limit(limit)
+        )
+        merge((await db.execute(stmt)).all())
+        
+        # Legacy single-language columns
+        uses = func.count().label("uses")
+        stmt = (
+            select(
+                Message.content,
+                Message.original_language,
+                Message.target_language,
+                Message.tone,
+                Message.translated_content,
+                uses
+            )
+            .where(
+                Message.created_at >= since,
+                Message.translation_status == TranslationStatusEnum.TRANSLATED,
+                Message.translated_content.isnot(None),
+                Message.target_language.isnot(None),
+                func.length(Message.content) <= WARMUP_MAX_TEXT_LENGTH
+            )
+            .group_by(
+                Message.content,
+                Message.original_language,
+                Message.target_language,
+                Message.tone,
+                Message.translated_content
+            )
+            .order_by(uses.desc())
+            .limit(limit)
+        )
+        merge((await db.execute(stmt)).all())
+    
+    return found
+
+
+async def _warm() -> int:
+    # Lazy import: the translator is only loaded when needed
+    from app.services.mbart_translator.cache import make_cache_key
+    from app.services.mbart_translator.translation import MBartTranslator
+    
+    translator = await MBartTranslator.get_instance()
+    if translator.cache is None:
+        return 0
+    
+    since = datetime.utcnow() - timedelta(days=settings.TRANSLATION_WARMUP_DAYS)
+    found = await _frequent_translations(since, settings.TRANSLATION_WARMUP_MAX_ENTRIES)
+    
+    # Most used first, within the memory budget
+    entries: List[Tuple[str, str]] = []
+    budget = settings.TRANSLATION_WARMUP_MAX_BYTES
+    for (content, source, target, tone), (translated, _) in sorted(
+        found.items(), key=lambda item: item[1][1], reverse=True
+    ):
+        size = len(content.encode("utf-8")) + len(translated.encode("utf-8"))
+        if size > budget:
+            break
+        budget -= size
+        entries.append((
+            make_cache_key(content, source, target, tone, translator.model),
+            translated
+        ))
+        if len(entries) >= settings.TRANSLATION_WARMUP_MAX_ENTRIES:
+            break
+    
+    await translator.cache.preload(entries)
+    return len(entries)
+
+
+async def warm_translation_cache() -> None:
+    """
+    Preload the translation cache with the most frequent recent translations.
+    Runs in the background after startup, bounded by TRANSLATION_WARMUP_TIMEOUT
+    and TRANSLATION_WARMUP_MAX_BYTES; readiness does not wait for it.
+    """
+    if not (settings.TRANSLATION_WARMUP_ENABLED and settings.TRANSLATION_CACHE_ENABLED):
+        return
+    
+    try:
+        count = await asyncio.wait_for(_warm(), settings.TRANSLATION_WARMUP_TIMEOUT)
+        print(f"✅ Translation cache warmed up ({count} entries)")
+    except asyncio.TimeoutError:
+        print("⚠️ Translation cache warm-up timed out")
+    except Exception as e:
+        print(f"⚠️ Translation cache warm-up failed: {str(e)}")
@@ -0,0 +1,196 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional, Set
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+
+# handler(channel, data) called for every event published by another worker
+Handler = Callable[[str, str], Awaitable[None]]
+
+# Every worker subscribes: which users each worker holds sockets for, heartbeats
+WORKERS_CHANNEL = "workers"
+
+
+def user_channel(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+def conversation_channel(conversation_id: UUID) -> str:
+    return f"conv:{conversation_id}"
+
+
+def presence_channel(user_id: UUID) -> str:
+    return f"presence:{user_id}"
+
+
+class Backplane(ABC):
+    """
+    Pub/sub link between the workers holding WebSocket connections.
+
+    Events are published on `user:<id>` and `conv:<id>` channels; a worker only
+    subscribes to the channels of the users and conversations it holds sockets
+    for. Presence transitions are also published on `presence:<id>`, for the
+    workers holding explicit presence subscribers of that user. Every payload carries the publishing worker's origin id so a worker
+    never receives its own events back (it already delivered them locally).
+    All workers also share the `workers` channel, where they announce which
+    users they hold sockets for (cross-worker presence) and send heartbeats.
+    """
+
+    def __init__(self):
+        self.origin = uuid4().hex
+        self.handler: Optional[Handler] = None
+        self.published = 0
+        self.received = 0
+
+    async def start(self, handler: Handler) -> None:
+        self.handler = handler
+
+    async def stop(self) -> None:
+        self.handler = None
+
+    async def publish(self, channel: str, data: str) -> None:
+        """Publish an encoded event to the other workers subscribed to channel"""
+        self.published += 1
+        await self._publish(channel, f"{self.origin} {data}")
+
+    async def _deliver(self, channel: str, payload: str) -> None:
+        origin, _, data = payload.partition(" ")
+        if origin == self.origin or self.handler is None:
+            return
+
+        self.received += 1
+        try:
+            await self.handler(channel, data)
+        except Exception as e:
+            print(f"Backplane delivery error ({channel}): {str(e)}")
+
+    @abstractmethod
+    async def _publish(self, channel: str, payload: str) -> None:
+        """Send a payload (origin included) on a channel"""
+
+    @abstractmethod
+    async def subscribe(self, channel: str) -> None:
+        pass
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str) -> None:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {"published": self.published, "received": self.received}
+
+
+class InMemoryHub:
+    """Channel registry shared by the in-memory backplanes of one process"""
+
+    def __init__(self):
+        self.channels: Dict[str, Set["InMemoryBackplane"]] = {}
+
+
+class InMemoryBackplane(Backplane):
+    """
+    Backplane within a single process: several ConnectionManager instances
+    (e.g. simulated workers in tests) sharing one hub.
+    """
+
+    def __init__(self, hub: Optional[InMemoryHub] = None):
+        super().__init__()
+        self.hub = hub or default_hub
+
+    async def stop(self) -> None:
+        for subscribers in self.hub.channels.values():
+            subscribers.discard(self)
+        await super().stop()
+
+    async def _publish(self, channel: str, payload: str) -> None:
+        for backplane in list(self.hub.channels.get(channel, ())):
+            await backplane._deliver(channel, payload)
+
+    async def subscribe(self, channel: str) -> None:
+        self.hub.channels.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, channel: str) -> None:
+        subscribers = self.hub.channels.get(channel)
+        if subscribers is not None:
+            subscribers.discard(self)
+            if not subscribers:
+                del self.hub.channels[channel]
+
+
+class RedisBackplane(Backplane):
+    """Backplane over Redis pub/sub (redis package, optional dependency)"""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+        self.redis = None
+        self.pubsub = None
+        self.reader: Optional[asyncio.Task] = None
+        # The pub/sub connection only exists after the first subscription
+        self.subscribed = asyncio.Event()
+
+    async def start(self, handler: Handler) -> None:
+        import redis.asyncio as redis
+
+        await super().start(handler)
+        self.redis = redis.from_url(self.url, decode_responses=True)
+        self.pubsub = self.redis.pubsub()
+        self.reader = asyncio.create_task(self._read())
+
+    async def stop(self) -> None:
+        if self.reader is not None:
+            self.reader.cancel()
+            await asyncio.gather(self.reader, return_exceptions=True)
+            self.reader = None
+        if self.pubsub is not None:
+            await self.pubsub.close()
+        if self.redis is not None:
+            await self.redis.close()
+        await super().stop()
+
+    async def _read(self) -> None:
+        await self.subscribed.wait()
+        while True:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Redis backplane error: {str(e)}")
+                await asyncio.sleep(1.0)
+                continue
+            if message is not None and message["type"] == "message":
+                await self._deliver(message["channel"], message["data"])
+
+    async def _publish(self, channel: str, payload: str) -> None:
+        await self.redis.publish(channel, payload)
+
+    async def subscribe(self, channel: str) -> None:
+        await self.pubsub.subscribe(channel)
+        self.subscribed.set()
+
+    async def unsubscribe(self, channel: str) -> None:
+        await self.pubsub.unsubscribe(channel)
+
+
+default_hub = InMemoryHub()
+
+
+def create_backplane(name: str) -> Optional[Backplane]:
+    """
+    Backplane chosen by settings.WS_BACKPLANE ("" for a single worker).
+    The redis package is only imported when the Redis backplane is used.
+    """
+    if not name:
+        return None
+    if name == "memory":
+        return InMemoryBackplane()
+    if name == "redis":
+        try:
+            import redis.asyncio  # noqa: F401
+        except ImportError:
+            print("⚠️ Redis backplane unavailable (redis package missing), WebSocket events stay local")
+            return None
+        return RedisBackplane(settings.REDIS_URL)
+    raise ValueError(f"Unknown WebSocket backplane: {name!r}")
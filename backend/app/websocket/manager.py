@@ -1,10 +1,120 @@
-from typing import Dict, Set
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
 from uuid import UUID
+from collections import deque
 import json
+import time
 import asyncio
 from datetime import datetime
 
+from app.core.config import settings
+from app.websocket.backplane import (
+    WORKERS_CHANNEL,
+    Backplane,
+    conversation_channel,
+    create_backplane,
+    presence_channel,
+    user_channel,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_event(message: dict) -> str:
+    """Serialize an event once for all its recipients (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(message).decode()
+    return json.dumps(message, separators=(",", ":"))
+
+
+def coalesce_key(message: dict) -> Optional[Tuple[Any, ...]]:
+    """Events that only carry the latest state: a newer one replaces a queued one"""
+    event_type = message.get("type")
+    data = message.get("data") or {}
+    if event_type == "typing":
+        return ("typing", data.get("user_id"), data.get("conversation_id"))
+    return None
+
+
+class OutboundQueue:
+    """
+    Bounded queue of encoded frames waiting to be written to one WebSocket.
+    
+    Overflow policy, in order:
+    1. a newer typing state replaces the queued one (coalescing);
+    2. when full, the oldest droppable event (WS_DROPPABLE_EVENTS) is dropped,
+       or the new one if it is droppable itself;
+    3. when full of undroppable events, the queue may overshoot (bursts) but
+       put() returns False, and the consumer is evicted, once it has stayed full
+       for WS_SEND_TIMEOUT or holds twice its size (unless WS_EVICT_SLOW_CONSUMERS
+       is off: the oldest event is dropped instead).
+    
+    put() never waits, so producers are never held back by a slow consumer.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        # [event_type, coalesce_key, text]
+        self.items: Deque[List[Any]] = deque()
+        self.ready = asyncio.Event()
+        # Monotonic time since which the queue is full of undroppable events
+        self.full_since: Optional[float] = None
+        self.dropped = 0
+        self.coalesced = 0
+    
+    def put(self, event_type: str, key: Optional[Tuple[Any, ...]], text: str) -> bool:
+        """Queue a frame without waiting; False means the consumer is too slow"""
+        if key is not None:
+            for item in self.items:
+                if item[1] == key:
+                    item[2] = text
+                    self.coalesced += 1
+                    return True
+        
+        if len(self.items) >= self.maxsize and not self._drop_oldest_droppable():
+            if event_type in settings.WS_DROPPABLE_EVENTS:
+                self.dropped += 1
+                return True
+            if settings.WS_EVICT_SLOW_CONSUMERS:
+                now = time.monotonic()
+                if self.full_since is None:
+                    self.full_since = now
+                if (
+                    now - self.full_since > settings.WS_SEND_TIMEOUT
+                    or len(self.items) >= 2 * self.maxsize
+                ):
+                    return False
+            else:
+                self.items.popleft()
+                self.dropped += 1
+        
+        self.append(event_type, key, text)
+        return True
+    
+    def append(self, event_type: str, key: Optional[Tuple[Any, ...]], text: str):
+        self.items.append([event_type, key, text])
+        self.ready.set()
+    
+    def _drop_oldest_droppable(self) -> bool:
+        for item in self.items:
+            if item[0] in settings.WS_DROPPABLE_EVENTS:
+                self.items.remove(item)
+                self.dropped += 1
+                return True
+        return False
+    
+    async def get(self) -> str:
+        while not self.items:
+            self.ready.clear()
+            await self.ready.wait()
+        text = self.items.popleft()[2]
+        if len(self.items) < self.maxsize:
+            self.full_since = None
+        return text
+
 
 class ConnectionManager:
     """Manage WebSocket connections"""
@@ -14,21 +124,111 @@ class ConnectionManager:
         self.active_connections: Dict[UUID, Set[WebSocket]] = {}
         # conversation_id -> set of user_ids
         self.conversation_participants: Dict[UUID, Set[UUID]] = {}
+        # WebSocket -> (outbound queue, writer task)
+        self.outbound: Dict[WebSocket, Tuple[OutboundQueue, asyncio.Task]] = {}
+        self.evicted = 0
+        # user_id -> conversation rooms (reverse index of conversation_participants)
+        self.user_conversations: Dict[UUID, Set[UUID]] = {}
+        # Explicit presence subscriptions: target -> subscribers, subscriber -> targets
+        self.presence_subscribers: Dict[UUID, Set[UUID]] = {}
+        self.presence_subscriptions: Dict[UUID, Set[UUID]] = {}
+        # user_id -> (is_online, monotonic time, timestamp) not published yet
+        self.presence_changes: Dict[UUID, Tuple[bool, float, str]] = {}
+        # user_id -> timestamp, users announced online to their contacts
+        self.announced_online: Dict[UUID, str] = {}
+        # (user_id, conversation_id) -> (last forwarded, expires at), monotonic times
+        self.typing: Dict[Tuple[UUID, UUID], Tuple[float, float]] = {}
+        self.tasks: List[asyncio.Task] = []
+        # Cross-worker fan-out (None: single worker)
+        self.backplane: Optional[Backplane] = None
+        # conversation_id -> participants connected to this worker (conv: channel refcount)
+        self.online_members: Dict[UUID, int] = {}
+        # Presence received from other workers: recipient -> user_id -> entry
+        self.remote_presence: Dict[UUID, Dict[str, dict]] = {}
+        # user_id -> timestamp, users announced online by other workers
+        self.remote_online: Dict[UUID, str] = {}
+        # Sockets held by other workers: user_id -> worker origins, origin -> user_ids
+        self.remote_holders: Dict[UUID, Set[str]] = {}
+        self.worker_users: Dict[str, Set[UUID]] = {}
+        # origin -> monotonic time of the worker's last message
+        self.worker_seen: Dict[str, float] = {}
     
-    async def connect(self, websocket: WebSocket, user_id: UUID):
-        """Connect a user"""
+    async def start(self):
+        """Start the backplane, the periodic presence_batch flush and typing expiry"""
+        self.backplane = create_backplane(settings.WS_BACKPLANE)
+        self.tasks = [
+            asyncio.create_task(self._presence_loop()),
+            asyncio.create_task(self._typing_loop()),
+        ]
+        
+        if self.backplane is not None:
+            await self.backplane.start(self._on_backplane_event)
+            await self.backplane.subscribe(WORKERS_CHANNEL)
+            # Running workers answer with the users they hold
+            await self._publish_worker_event({"kind": "hello"})
+            self.tasks.append(asyncio.create_task(self._heartbeat_loop()))
+    
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        
+        if self.backplane is not None:
+            # Other workers forget the sockets held here
+            await self._publish_worker_event({"kind": "holding", "user_ids": []})
+            await self.backplane.stop()
+            self.backplane = None
+    
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: UUID,
+        conversation_rooms: Optional[Dict[UUID, List[UUID]]] = None
+    ):
+        """Connect a user (conversation_rooms: conversation_id -> participant ids)"""
         await websocket.accept()
         
+        for conversation_id, participant_ids in (conversation_rooms or {}).items():
+            for participant_id in participant_ids:
+                self._join_room(participant_id, conversation_id)
+        
         if user_id not in self.active_connections:
             self.active_connections[user_id] = set()
+            
+            # First connection on this worker: receive the user's events from the others
+            self._subscribe(user_channel(user_id))
+            await self._publish_worker_event({"kind": "held", "user_id": str(user_id), "held": True})
+            for conversation_id in self.user_conversations.get(user_id, ()):
+                self._member_online(conversation_id, 1)
         
         self.active_connections[user_id].add(websocket)
         
-        # Notify others that user is online
-        await self.broadcast_user_status(user_id, is_online=True)
+        queue = OutboundQueue(settings.WS_MESSAGE_QUEUE_SIZE)
+        writer = asyncio.create_task(self._writer(websocket, user_id, queue))
+        self.outbound[websocket] = (queue, writer)
+        
+        # Contacts are told in the next presence_batch
+        self._presence_changed(user_id, is_online=True)
+        
+        # Snapshot of the contacts already online, for this connection
+        snapshot = [
+            self._presence_entry(contact)
+            for contact in self._contacts(user_id) | self.presence_subscriptions.get(user_id, set())
+            if contact in self.announced_online or contact in self.remote_online
+        ]
+        if snapshot:
+            await self.send_to_socket({
+                "type": "presence_batch",
+                "data": {"users": snapshot}
+            }, websocket, user_id)
     
     def disconnect(self, websocket: WebSocket, user_id: UUID):
         """Disconnect a user"""
+        outbound = self.outbound.pop(websocket, None)
+        if outbound is not None:
+            outbound[1].cancel()
+        
         if user_id in self.active_connections:
             self.active_connections[user_id].discard(websocket)
             
@@ -36,29 +236,94 @@ class ConnectionManager:
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
                 
-                # Notify others that user is offline
-                asyncio.create_task(
-                    self.broadcast_user_status(user_id, is_online=False)
-                )
+                self._unsubscribe(user_channel(user_id))
+                if self.backplane is not None:
+                    asyncio.create_task(self._publish_worker_event({
+                        "kind": "held", "user_id": str(user_id), "held": False
+                    }))
+                for conversation_id in self.user_conversations.get(user_id, ()):
+                    self._member_online(conversation_id, -1)
+                
+                # Contacts are told after the grace window, unless the user reconnects
+                self._presence_changed(user_id, is_online=False)
+                
+                # Stop the user's typing indicators
+                for user, conversation_id in list(self.typing):
+                    if user == user_id:
+                        del self.typing[(user, conversation_id)]
+                        asyncio.create_task(
+                            self.broadcast_typing_indicator(user_id, conversation_id, False)
+                        )
     
     def is_user_online(self, user_id: UUID) -> bool:
-        """Check if user is online"""
+        """Check if user is online (connected to this worker)"""
         return user_id in self.active_connections and len(self.active_connections[user_id]) > 0
     
+    def is_user_reachable(self, user_id: UUID) -> bool:
+        """Whether the user has a socket on this worker or on another one (backplane)"""
+        return self.is_user_online(user_id) or bool(self.remote_holders.get(user_id))
+    
+    async def _writer(self, websocket: WebSocket, user_id: UUID, queue: OutboundQueue):
+        """Drain a connection's outbound queue; a failed or timed-out write evicts it"""
+        while True:
+            text = await queue.get()
+            try:
+                await asyncio.wait_for(websocket.send_text(text), settings.WS_SEND_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._evict(websocket, user_id)
+                return
+    
+    def _evict(self, websocket: WebSocket, user_id: UUID):
+        """Drop a slow or broken consumer; its receive loop ends on the close"""
+        if websocket not in self.outbound:
+            return
+        self.evicted += 1
+        self.disconnect(websocket, user_id)
+        asyncio.create_task(self._close(websocket))
+    
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            # 1013: try again later
+            await asyncio.wait_for(websocket.close(code=1013), settings.WS_SEND_TIMEOUT)
+        except Exception:
+            pass
+    
+    async def _fan_out(self, message: dict, targets: List[Tuple[UUID, WebSocket]]):
+        """Queue the same frame (encoded once) on all target connections"""
+        if not targets:
+            return
+        
+        text = encode_event(message)
+        event_type = message.get("type")
+        key = coalesce_key(message)
+        
+        for user_id, connection in targets:
+            outbound = self.outbound.get(connection)
+            if outbound is not None and not outbound[0].put(event_type, key, text):
+                self._evict(connection, user_id)
+    
+    async def send_to_socket(self, message: dict, websocket: WebSocket, user_id: UUID):
+        """Send message to one connection (replies to that client)"""
+        await self._fan_out(message, [(user_id, websocket)])
+    
+    def _connections_of(self, user_ids: Iterable[UUID]) -> List[Tuple[UUID, WebSocket]]:
+        return [
+            (user_id, connection)
+            for user_id in user_ids
+            for connection in list(self.active_connections.get(user_id, ()))
+        ]
+    
     async def send_personal_message(self, message: dict, user_id: UUID):
-        """Send message to a specific user (all their connections)"""
-        if user_id in self.active_connections:
-            disconnected = set()
-            
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    disconnected.add(connection)
-            
-            # Clean up disconnected connections
-            for conn in disconnected:
-                self.active_connections[user_id].discard(conn)
+        """Send message to a specific user (all their connections, on every worker)"""
+        await self._send_local(message, [user_id])
+        await self._publish(user_channel(user_id), {
+            "kind": "user",
+            "user_id": str(user_id),
+            "message": message
+        })
     
     async def send_to_conversation(
         self,
@@ -66,44 +331,412 @@ class ConnectionManager:
         conversation_id: UUID,
         exclude_user: UUID = None
     ):
-        """Send message to all participants in a conversation"""
+        """Send message to all participants in a conversation (on every worker)"""
+        await self._send_local_conversation(message, conversation_id, exclude_user)
+        await self._publish(conversation_channel(conversation_id), {
+            "kind": "conversation",
+            "conversation_id": str(conversation_id),
+            "exclude_user": str(exclude_user) if exclude_user else None,
+            "message": message
+        })
+    
+    async def _send_local(self, message: dict, user_ids: Iterable[UUID]):
+        targets = self._connections_of(user_ids)
+        if targets:
+            await self._fan_out(message, targets)
+    
+    async def _send_local_conversation(
+        self,
+        message: dict,
+        conversation_id: UUID,
+        exclude_user: Optional[UUID] = None
+    ):
         if conversation_id in self.conversation_participants:
-            for user_id in self.conversation_participants[conversation_id]:
-                if exclude_user and user_id == exclude_user:
-                    continue
-                
-                await self.send_personal_message(message, user_id)
+            user_ids = [
+                user_id for user_id in self.conversation_participants[conversation_id]
+                if not (exclude_user and user_id == exclude_user)
+            ]
+            await self._send_local(message, user_ids)
+    
+    async def _publish(self, channel: str, event: dict):
+        """Forward an event to the other workers (no-op without a backplane)"""
+        if self.backplane is None:
+            return
+        try:
+            await self.backplane.publish(channel, encode_event(event))
+        except Exception as e:
+            print(f"Backplane publish error ({channel}): {str(e)}")
+    
+    async def _on_backplane_event(self, channel: str, data: str):
+        """Deliver an event published by another worker to the sockets held here"""
+        event = json.loads(data)
+        kind = event.get("kind")
+        
+        if kind == "user":
+            await self._send_local(event["message"], [UUID(event["user_id"])])
+        elif kind == "conversation":
+            exclude_user = event.get("exclude_user")
+            await self._send_local_conversation(
+                event["message"],
+                UUID(event["conversation_id"]),
+                UUID(exclude_user) if exclude_user else None
+            )
+        elif kind == "join":
+            self._join_room(UUID(event["user_id"]), UUID(event["conversation_id"]))
+        elif kind == "presence":
+            conversation_id = event.get("conversation_id")
+            self._receive_presence(UUID(conversation_id) if conversation_id else None, event["entry"])
+        else:
+            await self._on_worker_event(event)
+    
+    async def _publish_worker_event(self, event: dict):
+        if self.backplane is not None:
+            await self._publish(WORKERS_CHANNEL, {**event, "origin": self.backplane.origin})
+    
+    async def _on_worker_event(self, event: dict):
+        """Track which users the other workers hold sockets for"""
+        origin = event["origin"]
+        kind = event["kind"]
+        known = origin in self.worker_seen
+        self.worker_seen[origin] = time.monotonic()
+        
+        if kind == "alive" and not known:
+            # Worker forgotten after missed heartbeats: ask everyone for their lists again
+            await self._publish_worker_event({"kind": "hello"})
+        elif kind == "hello":
+            await self._publish_worker_event({
+                "kind": "holding",
+                "user_ids": [str(user_id) for user_id in self.active_connections]
+            })
+        elif kind == "holding":
+            # Full list (answer to hello, or empty when the worker stops)
+            for user_id in self.worker_users.pop(origin, set()):
+                self._set_remote_holder(origin, user_id, False)
+            for user_id in event["user_ids"]:
+                self._set_remote_holder(origin, UUID(user_id), True)
+            if not event["user_ids"]:
+                self.worker_seen.pop(origin, None)
+        elif kind == "held":
+            self._set_remote_holder(origin, UUID(event["user_id"]), event["held"])
+    
+    def _set_remote_holder(self, origin: str, user_id: UUID, held: bool):
+        holders = self.remote_holders.setdefault(user_id, set())
+        users = self.worker_users.setdefault(origin, set())
+        if held:
+            holders.add(origin)
+            users.add(user_id)
+        else:
+            holders.discard(origin)
+            users.discard(user_id)
+        if not holders:
+            del self.remote_holders[user_id]
+        if not users:
+            del self.worker_users[origin]
+    
+    async def _heartbeat_loop(self):
+        """Announce this worker and forget workers that went silent (crashed)"""
+        while True:
+            await asyncio.sleep(settings.WS_HEARTBEAT_INTERVAL)
+            try:
+                await self._publish_worker_event({"kind": "alive"})
+                silent_since = time.monotonic() - 3 * settings.WS_HEARTBEAT_INTERVAL
+                for origin, seen in list(self.worker_seen.items()):
+                    if seen < silent_since:
+                        del self.worker_seen[origin]
+                        for user_id in list(self.worker_users.get(origin, ())):
+                            self._set_remote_holder(origin, user_id, False)
+            except Exception as e:
+                print(f"Backplane heartbeat error: {str(e)}")
+    
+    def _subscribe(self, channel: str):
+        if self.backplane is not None:
+            asyncio.create_task(self._channel_call(self.backplane.subscribe, channel))
+    
+    def _unsubscribe(self, channel: str):
+        if self.backplane is not None:
+            asyncio.create_task(self._channel_call(self.backplane.unsubscribe, channel))
+    
+    @staticmethod
+    async def _channel_call(call, channel: str):
+        try:
+            await call(channel)
+        except Exception as e:
+            print(f"Backplane subscription error ({channel}): {str(e)}")
+    
+    def _member_online(self, conversation_id: UUID, delta: int):
+        """Track local online members of a room; subscribe to its channel while there are any"""
+        count = self.online_members.get(conversation_id, 0) + delta
+        if count > 0:
+            self.online_members[conversation_id] = count
+            if count == delta:
+                self._subscribe(conversation_channel(conversation_id))
+        elif conversation_id in self.online_members:
+            del self.online_members[conversation_id]
+            self._unsubscribe(conversation_channel(conversation_id))
     
     def join_conversation(self, user_id: UUID, conversation_id: UUID):
-        """Add user to conversation room"""
+        """Add user to conversation room (on the workers holding the user's sockets too)"""
+        self._join_room(user_id, conversation_id)
+        self._drop_idle_room(conversation_id)
+        
+        if self.backplane is not None:
+            asyncio.create_task(self._publish(user_channel(user_id), {
+                "kind": "join",
+                "user_id": str(user_id),
+                "conversation_id": str(conversation_id)
+            }))
+    
+    def _join_room(self, user_id: UUID, conversation_id: UUID):
         if conversation_id not in self.conversation_participants:
             self.conversation_participants[conversation_id] = set()
         
-        self.conversation_participants[conversation_id].add(user_id)
+        if user_id not in self.conversation_participants[conversation_id]:
+            self.conversation_participants[conversation_id].add(user_id)
+            self.user_conversations.setdefault(user_id, set()).add(conversation_id)
+            if self.is_user_online(user_id):
+                self._member_online(conversation_id, 1)
     
     def leave_conversation(self, user_id: UUID, conversation_id: UUID):
         """Remove user from conversation room"""
+        conversations = self.user_conversations.get(user_id)
+        if conversations is not None:
+            conversations.discard(conversation_id)
+            if not conversations:
+                del self.user_conversations[user_id]
+        
         if conversation_id in self.conversation_participants:
+            if user_id in self.conversation_participants[conversation_id] and self.is_user_online(user_id):
+                self._member_online(conversation_id, -1)
             self.conversation_participants[conversation_id].discard(user_id)
             
             # Clean up empty conversation rooms
             if not self.conversation_participants[conversation_id]:
                 del self.conversation_participants[conversation_id]
     
-    async def broadcast_user_status(self, user_id: UUID, is_online: bool):
-        """Broadcast user online/offline status to all connected users"""
-        status_message = {
-            "type": "user_status",
-            "data": {
-                "user_id": str(user_id),
-                "is_online": is_online,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+    def _drop_idle_room(self, conversation_id: UUID):
+        """
+        Forget a room none of whose members is online here (or awaiting their
+        presence flush): rooms are reloaded by connect(), so keeping it would
+        only leak the participants who never connect to this worker
+        """
+        members = self.conversation_participants.get(conversation_id)
+        if members is None or any(
+            self.is_user_online(member) or member in self.presence_changes
+            for member in members
+        ):
+            return
+        
+        del self.conversation_participants[conversation_id]
+        for member in members:
+            conversations = self.user_conversations.get(member)
+            if conversations is not None:
+                conversations.discard(conversation_id)
+                if not conversations:
+                    del self.user_conversations[member]
+    
+    def subscribe_presence(self, subscriber_id: UUID, user_ids: List[UUID]) -> List[dict]:
+        """Follow the presence of users outside shared conversations; returns their current state"""
+        subscriptions = self.presence_subscriptions.setdefault(subscriber_id, set())
+        for user_id in user_ids:
+            if len(subscriptions) >= settings.WS_PRESENCE_MAX_SUBSCRIPTIONS:
+                break
+            if user_id != subscriber_id:
+                subscriptions.add(user_id)
+                if user_id not in self.presence_subscribers:
+                    # Transitions published by the worker holding the user
+                    self.presence_subscribers[user_id] = set()
+                    self._subscribe(presence_channel(user_id))
+                self.presence_subscribers[user_id].add(subscriber_id)
+        
+        return [self._presence_entry(user_id) for user_id in user_ids if user_id in subscriptions]
+    
+    def unsubscribe_presence(self, subscriber_id: UUID, user_ids: Optional[List[UUID]] = None):
+        """Stop following some users (all when user_ids is None)"""
+        subscriptions = self.presence_subscriptions.get(subscriber_id, set())
+        for user_id in list(subscriptions if user_ids is None else user_ids):
+            subscriptions.discard(user_id)
+            subscribers = self.presence_subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber_id)
+                if not subscribers:
+                    del self.presence_subscribers[user_id]
+                    self._unsubscribe(presence_channel(user_id))
+        if not subscriptions:
+            self.presence_subscriptions.pop(subscriber_id, None)
+    
+    def _contacts(self, user_id: UUID) -> Set[UUID]:
+        """Users sharing a conversation with user_id"""
+        contacts: Set[UUID] = set()
+        for conversation_id in self.user_conversations.get(user_id, ()):
+            contacts.update(self.conversation_participants.get(conversation_id, ()))
+        contacts.discard(user_id)
+        return contacts
+    
+    def _presence_audience(self, user_id: UUID) -> Set[UUID]:
+        """Online contacts and subscribers of user_id"""
+        audience = self._contacts(user_id) | self.presence_subscribers.get(user_id, set())
+        return {uid for uid in audience if self.is_user_online(uid)}
+    
+    def _presence_entry(self, user_id: UUID) -> dict:
+        timestamp = self.announced_online.get(user_id) or self.remote_online.get(user_id)
+        if timestamp is None and user_id in self.remote_holders:
+            # Held by a worker sharing no conversation with this one: never announced here
+            timestamp = datetime.utcnow().isoformat()
+        return {
+            "user_id": str(user_id),
+            "is_online": timestamp is not None,
+            "timestamp": timestamp or datetime.utcnow().isoformat()
         }
+    
+    def _presence_changed(self, user_id: UUID, is_online: bool):
+        # The latest transition wins; published by the next flush
+        self.presence_changes[user_id] = (is_online, time.monotonic(), datetime.utcnow().isoformat())
+    
+    def _collect_presence(self) -> Tuple[Dict[UUID, List[dict]], List[Tuple[dict, List[UUID]]]]:
+        """
+        Publishable presence transitions: entries grouped by local recipient, and
+        (entry, conversation rooms) for the other workers
+        """
+        now = time.monotonic()
+        batches: Dict[UUID, List[dict]] = {}
+        announcements: List[Tuple[dict, List[UUID]]] = []
+        
+        for user_id, (is_online, changed_at, timestamp) in list(self.presence_changes.items()):
+            if not is_online and now - changed_at < settings.WS_PRESENCE_GRACE:
+                # May still reconnect
+                continue
+            del self.presence_changes[user_id]
+            
+            if is_online == (user_id in self.announced_online):
+                # Flapped back within the grace window: nothing to tell
+                announce = False
+            elif is_online:
+                self.announced_online[user_id] = timestamp
+                # Unless already announced by the worker holding the user's other sockets
+                announce = user_id not in self.remote_online
+            else:
+                del self.announced_online[user_id]
+                # Unless still connected through another worker, which announces
+                # the offline transition when the user leaves it
+                announce = user_id not in self.remote_holders
+            
+            if announce:
+                entry = {"user_id": str(user_id), "is_online": is_online, "timestamp": timestamp}
+                for recipient in self._presence_audience(user_id):
+                    batches.setdefault(recipient, []).append(entry)
+                announcements.append((entry, list(self.user_conversations.get(user_id, ()))))
+            
+            if not is_online:
+                # Announced or not, rooms and subscriptions are reloaded on the next connect
+                for conversation_id in list(self.user_conversations.get(user_id, ())):
+                    self.leave_conversation(user_id, conversation_id)
+                    self._drop_idle_room(conversation_id)
+                self.unsubscribe_presence(user_id)
+        
+        return batches, announcements
+    
+    def _receive_presence(self, conversation_id: Optional[UUID], entry: dict):
+        """
+        Presence transition announced by another worker, queued for local room
+        members (or for local presence subscribers when conversation_id is None)
+        """
+        user_id = UUID(entry["user_id"])
+        if entry["is_online"]:
+            self.remote_online[user_id] = entry["timestamp"]
+        else:
+            self.remote_online.pop(user_id, None)
+        
+        recipients = (
+            self.conversation_participants.get(conversation_id, ())
+            if conversation_id is not None
+            else self.presence_subscribers.get(user_id, ())
+        )
+        for recipient in recipients:
+            if recipient != user_id and self.is_user_online(recipient):
+                self.remote_presence.setdefault(recipient, {})[entry["user_id"]] = entry
+    
+    async def flush_presence(self):
+        """Send pending presence transitions as one presence_batch frame per recipient"""
+        batches, announcements = self._collect_presence()
+        
+        # Other workers deliver to the room members and presence subscribers they hold
+        if self.backplane is not None:
+            for entry, conversation_ids in announcements:
+                await self._publish(presence_channel(UUID(entry["user_id"])), {
+                    "kind": "presence",
+                    "entry": entry
+                })
+                for conversation_id in conversation_ids:
+                    await self._publish(conversation_channel(conversation_id), {
+                        "kind": "presence",
+                        "conversation_id": str(conversation_id),
+                        "entry": entry
+                    })
+        
+        remote_presence, self.remote_presence = self.remote_presence, {}
+        for recipient, entries in remote_presence.items():
+            batches.setdefault(recipient, []).extend(entries.values())
+        
+        for recipient, entries in batches.items():
+            await self._send_local({
+                "type": "presence_batch",
+                "data": {"users": entries}
+            }, [recipient])
+    
+    async def _presence_loop(self):
+        while True:
+            await asyncio.sleep(settings.WS_PRESENCE_BATCH_INTERVAL)
+            try:
+                await self.flush_presence()
+            except Exception as e:
+                print(f"Presence flush error: {str(e)}")
+    
+    async def set_typing(
+        self,
+        user_id: UUID,
+        conversation_id: UUID,
+        is_typing: bool
+    ):
+        """
+        Update a user's typing state in a conversation and forward transitions only.
+        
+        While typing, repeated frames only extend the expiry; a refresh is forwarded
+        at most once per WS_TYPING_REFRESH_INTERVAL. Without a refresh for
+        WS_TYPING_TIMEOUT seconds the state expires and is_typing false is sent.
+        """
+        key = (user_id, conversation_id)
+        now = time.monotonic()
+        entry = self.typing.get(key)
         
-        # Send to all connected users
-        for uid in list(self.active_connections.keys()):
-            await self.send_personal_message(status_message, uid)
+        if not is_typing:
+            if entry is not None:
+                del self.typing[key]
+                await self.broadcast_typing_indicator(user_id, conversation_id, False)
+            return
+        
+        expires_at = now + settings.WS_TYPING_TIMEOUT
+        if entry is not None and now - entry[0] < settings.WS_TYPING_REFRESH_INTERVAL:
+            self.typing[key] = (entry[0], expires_at)
+            return
+        
+        self.typing[key] = (now, expires_at)
+        await self.broadcast_typing_indicator(user_id, conversation_id, True)
+    
+    async def expire_typing(self):
+        """Send is_typing false for typing states that were not refreshed in time"""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self.typing.items() if expires_at <= now]
+        for user_id, conversation_id in expired:
+            del self.typing[(user_id, conversation_id)]
+            await self.broadcast_typing_indicator(user_id, conversation_id, False)
+    
+    async def _typing_loop(self):
+        while True:
+            await asyncio.sleep(settings.WS_TYPING_TIMEOUT / 4)
+            try:
+                await self.expire_typing()
+            except Exception as e:
+                print(f"Typing expiry error: {str(e)}")
     
     async def broadcast_typing_indicator(
         self,
@@ -163,12 +796,82 @@ class ConnectionManager:
             "data": message_data
         }
         
+        # Sending ends the sender's typing indicator
+        await self.set_typing(sender_id, conversation_id, False)
+        
         await self.send_to_conversation(
             message,
             conversation_id,
             exclude_user=None  # Send to all including sender (for multi-device)
         )
 
+    async def send_message_translated(
+        self,
+        translation_data: dict,
+        user_id: UUID
+    ):
+        """Send a completed translation to one participant (in their language)"""
+        message = {
+            "type": "message_translated",
+            "data": translation_data
+        }
+
+        await self.send_personal_message(message, user_id)
+
+
+    async def send_translation_progress(
+        self,
+        progress_data: dict,
+        user_id: UUID
+    ):
+        """Send one translated sentence of a long message to one participant"""
+        message = {
+            "type": "translation_progress",
+            "data": progress_data
+        }
+
+        await self.send_personal_message(message, user_id)
+
+    async def send_message_edited(
+        self,
+        edit_data: dict,
+        user_id: UUID
+    ):
+        """Send an edit delta (content or translation) to one participant"""
+        message = {
+            "type": "message_edited",
+            "data": edit_data
+        }
+
+        await self.send_personal_message(message, user_id)
+
+    async def broadcast_message_edited(
+        self,
+        edit_data: dict,
+        conversation_id: UUID
+    ):
+        """Broadcast an edit delta of the original content to the conversation"""
+        message = {
+            "type": "message_edited",
+            "data": edit_data
+        }
+
+        await self.send_to_conversation(message, conversation_id)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection, outbound queue and backplane counters of this worker"""
+        queues = [queue for queue, _ in self.outbound.values()]
+        return {
+            "users": len(self.active_connections),
+            "connections": len(self.outbound),
+            "queued": sum(len(queue.items) for queue in queues),
+            "dropped": sum(queue.dropped for queue in queues),
+            "coalesced": sum(queue.coalesced for queue in queues),
+            "evicted": self.evicted,
+            "workers": len(self.worker_seen),
+            "backplane": self.backplane.stats() if self.backplane is not None else None,
+        }
+
 
 # Global connection manager instance
 manager = ConnectionManager()
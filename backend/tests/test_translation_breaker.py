@@ -0,0 +1,44 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.mbart_translator.config import Language, Tone
+from app.services.mbart_translator.providers import TranslationProvider
+from app.services.mbart_translator.resilience import CircuitOpenError, DeadlineExceeded
+from app.services.mbart_translator.translation import MBartTranslator
+
+
+class HungProvider(TranslationProvider):
+    name = "hung"
+    model = "hung"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def translate(self, texts, source_lang, target_lang):
+        self.calls += 1
+        await asyncio.sleep(3600)
+
+
+def test_hung_provider_opens_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSLATION_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "TRANSLATION_HEDGE_ENABLED", False)
+    monkeypatch.setattr(settings, "TRANSLATION_DEADLINE", 0.05)
+    monkeypatch.setattr(settings, "TRANSLATION_BREAKER_FAILURES", 3)
+
+    async def run():
+        provider = HungProvider()
+        translator = MBartTranslator(provider)
+        errors = []
+        for _ in range(10):
+            try:
+                await translator._translate_batch(["Bonjour"], Language.FR, Language.EN, Tone.STANDARD)
+            except (DeadlineExceeded, CircuitOpenError) as e:
+                errors.append(type(e))
+        await translator.close()
+        return provider, translator, errors
+
+    provider, translator, errors = asyncio.run(run())
+
+    assert provider.calls == 3
+    assert errors == [DeadlineExceeded] * 3 + [CircuitOpenError] * 7
+    assert translator.breaker.stats()["state"] == "open"
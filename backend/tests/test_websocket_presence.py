@@ -0,0 +1,121 @@
+import asyncio
+import json
+from uuid import uuid4
+
+from app.core.config import settings
+from app.websocket import backplane
+from app.websocket.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        pass
+
+
+def test_offline_cleanup_drops_rooms_of_users_never_connected(monkeypatch):
+    monkeypatch.setattr(settings, "WS_PRESENCE_GRACE", 0.0)
+
+    async def run():
+        manager = ConnectionManager()
+        a, b, c = uuid4(), uuid4(), uuid4()
+        room = uuid4()
+        websocket = FakeWebSocket()
+
+        await manager.connect(websocket, a, {room: [a, b, c]})
+        await manager.flush_presence()
+        assert manager.conversation_participants[room] == {a, b, c}
+
+        manager.disconnect(websocket, a)
+        await manager.flush_presence()
+        return manager
+
+    manager = asyncio.run(run())
+
+    assert manager.conversation_participants == {}
+    assert manager.user_conversations == {}
+    assert manager.online_members == {}
+
+
+def test_room_kept_while_a_member_is_online(monkeypatch):
+    monkeypatch.setattr(settings, "WS_PRESENCE_GRACE", 0.0)
+
+    async def run():
+        manager = ConnectionManager()
+        a, b, c = uuid4(), uuid4(), uuid4()
+        room = uuid4()
+        socket_a, socket_b = FakeWebSocket(), FakeWebSocket()
+
+        await manager.connect(socket_a, a, {room: [a, b, c]})
+        await manager.connect(socket_b, b, {room: [a, b, c]})
+        manager.disconnect(socket_a, a)
+        await manager.flush_presence()
+        return manager, a, b, c, room
+
+    manager, a, b, c, room = asyncio.run(run())
+
+    assert manager.conversation_participants[room] == {b, c}
+    assert a not in manager.user_conversations
+
+
+def test_presence_subscriber_on_another_worker(monkeypatch):
+    monkeypatch.setattr(settings, "WS_BACKPLANE", "memory")
+    monkeypatch.setattr(settings, "WS_PRESENCE_GRACE", 0.0)
+    monkeypatch.setattr(backplane, "default_hub", backplane.InMemoryHub())
+
+    async def run():
+        worker_a, worker_b = ConnectionManager(), ConnectionManager()
+        await worker_a.start()
+        await worker_b.start()
+        follower, followed = uuid4(), uuid4()
+        follower_socket, followed_socket = FakeWebSocket(), FakeWebSocket()
+
+        # No shared conversation: only the explicit subscription links them
+        await worker_a.connect(follower_socket, follower)
+        worker_a.subscribe_presence(follower, [followed])
+        await asyncio.sleep(0)
+
+        await worker_b.connect(followed_socket, followed)
+        await worker_b.flush_presence()
+        await worker_a.flush_presence()
+        await asyncio.sleep(0.01)
+        online = presence_of(follower_socket, followed)
+        reachable = worker_a.is_user_reachable(followed)
+
+        worker_b.disconnect(followed_socket, followed)
+        await asyncio.sleep(0)
+        await worker_b.flush_presence()
+        await worker_a.flush_presence()
+        await asyncio.sleep(0.01)
+        offline = presence_of(follower_socket, followed)
+
+        await worker_a.stop()
+        await worker_b.stop()
+        return online, reachable, offline, worker_a.remote_online
+
+    online, reachable, offline, remote_online = asyncio.run(run())
+
+    assert online == [True]
+    assert reachable
+    assert offline == [True, False]
+    assert remote_online == {}
+
+
+def presence_of(websocket, user_id):
+    states = []
+    for text in websocket.sent:
+        event = json.loads(text)
+        if event["type"] == "presence_batch":
+            states.extend(
+                entry["is_online"] for entry in event["data"]["users"]
+                if entry["user_id"] == str(user_id)
+            )
+    return states